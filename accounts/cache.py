@@ -0,0 +1,37 @@
+"""
+Per-user cache entries: the authenticated user and the profile payload.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f"accounts:user:{user_id}"
+
+
+def get_user_cache_ttl():
+    return getattr(settings, "AUTH_USER_CACHE_TTL", 15)
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def profile_cache_key(user_id):
+    return f"accounts:profile:{user_id}"
+
+
+def get_profile_cache_ttl():
+    return getattr(settings, "PROFILE_CACHE_TTL", 10 * 60)
+
+
+def invalidate_profile(user_id):
+    cache.delete(profile_cache_key(user_id))
+
+
+def profile_etag(user, detail_modified):
+    """Strong ETag of a profile, from the last change of the user and of its detail."""
+    stamp = f"{user.pk}:{user.last_modified.isoformat()}:{detail_modified.isoformat() if detail_modified else ''}"
+    return '"%s"' % hashlib.sha1(stamp.encode()).hexdigest()
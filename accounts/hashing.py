@@ -0,0 +1,46 @@
+"""
+Password hashing off the event loop.
+
+PBKDF2 and friends take hundreds of milliseconds per call but release the
+GIL, so async views run them in a bounded thread pool
+(``PASSWORD_HASH_WORKERS`` threads): a login storm queues up behind the pool
+instead of blocking every other request on the worker.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def get_workers():
+    return getattr(settings, "PASSWORD_HASH_WORKERS", None) or os.cpu_count() or 1
+
+
+@lru_cache(maxsize=None)
+def get_pool():
+    return ThreadPoolExecutor(get_workers(), thread_name_prefix="password-hash")
+
+
+async def run_hashing(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_pool(), func, *args)
+
+
+async def check_password(user, raw_password):
+    """
+    Check ``raw_password`` in the pool. When the stored hash is outdated it
+    is upgraded like ``User.check_password`` does, but saved from the
+    caller's thread: the pool threads never touch the database.
+    """
+    outdated = []
+    valid = await run_hashing(hashers.check_password, raw_password, user.password, outdated.append)
+    if valid and outdated:
+        await set_password(user, raw_password)
+        await user.asave(update_fields=["password"])
+    return valid
+
+
+async def set_password(user, raw_password):
+    await run_hashing(user.set_password, raw_password)
@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+from accounts.hashing import get_workers
+
+
+def _hash(hasher, count):
+    salt = hasher.salt()
+    for i in range(count):
+        hasher.encode(f"Password{i}!", salt)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report hashes/sec for each configured password hasher, on one thread and on the "
+        "PASSWORD_HASH_WORKERS pool size, to size workers for login peaks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hashes", type=int, default=20, help="Hashes per thread and hasher")
+        parser.add_argument("--threads", type=int, default=None, help="Pool size (default: PASSWORD_HASH_WORKERS)")
+
+    def handle(self, *args, **options):
+        count = options["hashes"]
+        threads = options["threads"] or get_workers()
+        self.stdout.write(f"{'hasher':<28}{'ms/hash':>10}{'1 thread/s':>12}{f'{threads} threads/s':>14}")
+        for hasher in get_hashers():
+            start = time.perf_counter()
+            try:
+                _hash(hasher, count)
+            except ValueError as exc:
+                # optional library (argon2-cffi, bcrypt) not installed
+                self.stdout.write(f"{hasher.algorithm:<28}{exc}")
+                continue
+            single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(threads) as pool:
+                for future in [pool.submit(_hash, hasher, count) for _ in range(threads)]:
+                    future.result()
+            pooled = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{hasher.algorithm:<28}{single * 1000 / count:>10.1f}{count / single:>12.1f}"
+                f"{count * threads / pooled:>14.1f}"
+            )
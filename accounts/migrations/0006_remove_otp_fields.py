@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:49
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_org_admin'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='email_otp',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='email_otp_ts',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='foget_otp',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='foget_otp_ts',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='foget_token',
+        ),
+    ]
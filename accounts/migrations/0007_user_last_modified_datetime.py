@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_remove_otp_fields'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='last_modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractUser
 from accounts.manager import CustomUserManager
 from django.core.validators import EmailValidator
 from accounts import validators as v
+from accounts.cache import invalidate_user
 import datetime as dt
 
 
@@ -39,21 +40,17 @@ class UserDetail(models.Model):
 class User(AbstractUser):
     username = None
     email = models.EmailField(unique=True, validators=[EmailValidator, v.validate_email])
-    last_modified = models.DateField(auto_now=True)
+    last_modified = models.DateTimeField(auto_now=True)
 
     user_detail = models.OneToOneField(UserDetail, null=True, blank=True, on_delete=models.SET_NULL, related_name="user")
     org_admin = models.BooleanField(default=False)
     
     # verification detail
+    # OTPs live in the OTP store (accounts.otp), not on the user row
     is_verified = models.BooleanField(default=False)
-    email_otp = models.CharField(max_length=6,blank=True, null=True)
-    email_otp_ts = models.DateTimeField(blank=True, null=True)
     email_verified_at = models.DateTimeField(blank=True, null=True)
     
     # forgot password
-    foget_otp = models.CharField(max_length=6,blank=True, null=True)
-    foget_token = models.CharField(max_length=100, null=True, blank=True)
-    foget_otp_ts = models.DateTimeField(blank=True, null=True)
     last_forgeted_at = models.DateTimeField(blank=True, null=True)
     
     # suspension
@@ -77,3 +74,11 @@ class User(AbstractUser):
         if not self.email.islower():
             self.email = self.email.strip().lower()
         super().save(*args, **kwargs)
+        # drop the copy CachedJWTAuthentication resolves requests from
+        invalidate_user(self.pk)
+
+    def delete(self, *args, **kwargs):
+        user_id = self.pk
+        result = super().delete(*args, **kwargs)
+        invalidate_user(user_id)
+        return result
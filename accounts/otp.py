@@ -0,0 +1,75 @@
+"""
+One-time passwords kept outside the user table.
+
+``get_otp_store(purpose)`` returns the store configured by ``OTP_STORE``.
+The default keeps a hash of the code in Django's cache with a native expiry
+(``OTP_TTL``) and counts wrong guesses with an atomic ``incr``; after
+``OTP_MAX_ATTEMPTS`` the code is dropped and a new one has to be issued.
+"""
+import secrets
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.module_loading import import_string
+
+PURPOSE_EMAIL_VERIFY = "email_verify"
+PURPOSE_PASSWORD_RESET = "password_reset"
+
+VERIFIED = "verified"
+INVALID = "invalid"
+EXPIRED = "expired"
+
+
+class CacheOTPStore:
+    def __init__(self, purpose, ttl=None, max_attempts=None, cache_alias=None):
+        self.purpose = purpose
+        self.ttl = ttl or getattr(settings, "OTP_TTL", 10 * 60)
+        self.max_attempts = max_attempts or getattr(settings, "OTP_MAX_ATTEMPTS", 5)
+        self.cache = caches[cache_alias or getattr(settings, "OTP_CACHE", "default")]
+
+    def _key(self, email):
+        return f"otp:{self.purpose}:{email.lower()}"
+
+    def _digest(self, email, code):
+        return salted_hmac(f"accounts.otp.{self.purpose}", f"{email.lower()}:{code}").hexdigest()
+
+    def issue(self, email, length=6):
+        """Create a code for ``email``, replacing any previous one, and return it."""
+        code = f"{secrets.randbelow(10 ** length):0{length}d}"
+        key = self._key(email)
+        self.cache.set_many({key: self._digest(email, code), f"{key}:attempts": 0}, self.ttl)
+        return code
+
+    def verify(self, email, code):
+        """
+        Check ``code`` and return ``VERIFIED``, ``INVALID`` or ``EXPIRED``.
+        A verified code is consumed.
+        """
+        key = self._key(email)
+        digest = self.cache.get(key)
+        if digest is None:
+            return EXPIRED
+
+        try:
+            attempts = self.cache.incr(f"{key}:attempts")
+        except ValueError:
+            # the counter expired between the two reads
+            return EXPIRED
+        if attempts > self.max_attempts:
+            self.discard(email)
+            return EXPIRED
+
+        if not constant_time_compare(digest, self._digest(email, str(code).strip())):
+            return INVALID
+        self.discard(email)
+        return VERIFIED
+
+    def discard(self, email):
+        key = self._key(email)
+        self.cache.delete_many([key, f"{key}:attempts"])
+
+
+def get_otp_store(purpose):
+    store_class = import_string(getattr(settings, "OTP_STORE", "accounts.otp.CacheOTPStore"))
+    return store_class(purpose)
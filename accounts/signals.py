@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.cache import invalidate_profile
+from accounts.models import User, UserDetail
+
+
+@receiver([post_save, post_delete], sender=User)
+def drop_user_profile(sender, instance, **kwargs):
+    invalidate_profile(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=UserDetail)
+def drop_detail_profile(sender, instance, **kwargs):
+    for user_id in User.objects.filter(user_detail_id=instance.pk).values_list("pk", flat=True):
+        invalidate_profile(user_id)
@@ -1,3 +1,177 @@
-from django.test import TestCase
+from unittest import mock
+from urllib.parse import urlencode
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts import hashing
+from accounts.authentication import CachedJWTAuthentication
+from accounts.models import User
+from accounts.otp import EXPIRED, INVALID, VERIFIED, CacheOTPStore
+from accounts.throttling import SlidingWindowLimiter
+
+NEW_PASSWORD = "Newpass@123"
+
+
+class AccountsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="member@x.com", password="Oldpass@123", is_verified=True)
+
+    def auth(self, user=None):
+        return {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user or self.user).access_token}"}
+
+
+class CachedAuthenticationTests(AccountsTestCase):
+    def test_user_is_resolved_from_the_cache_until_saved(self):
+        token = AccessToken.for_user(self.user)
+        auth = CachedJWTAuthentication()
+        self.assertEqual(auth.get_user(token), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(auth.get_user(token), self.user)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            auth.get_user(token)
+
+
+class OTPStoreTests(AccountsTestCase):
+    def test_code_is_consumed_once_verified(self):
+        store = CacheOTPStore("test")
+        code = store.issue("Member@x.com")
+        wrong = "000000" if code != "000000" else "111111"
+        self.assertEqual(store.verify("member@x.com", wrong), INVALID)
+        self.assertEqual(store.verify("member@x.com", code), VERIFIED)
+        self.assertEqual(store.verify("member@x.com", code), EXPIRED)
+
+    def test_code_is_dropped_after_too_many_guesses(self):
+        store = CacheOTPStore("test", max_attempts=2)
+        code = store.issue("member@x.com")
+        wrong = "000000" if code != "000000" else "111111"
+        self.assertEqual(store.verify("member@x.com", wrong), INVALID)
+        self.assertEqual(store.verify("member@x.com", wrong), INVALID)
+        self.assertEqual(store.verify("member@x.com", code), EXPIRED)
+
+    def test_user_row_holds_no_otp(self):
+        self.assertFalse(any("otp" in field.name for field in User._meta.get_fields()))
+
+
+class ProfileTests(AccountsTestCase):
+    def test_conditional_get(self):
+        response = self.client.get("/users/profile/", **self.auth())
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = self.client.get("/users/profile/", HTTP_IF_NONE_MATCH=etag, **self.auth())
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_profile_update_changes_the_etag(self):
+        etag = self.client.get("/users/profile/", **self.auth())["ETag"]
+        response = self.client.post(
+            "/users/profile/", {"phone": "9876543210", "first_name": "Member"}, **self.auth()
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+
+        response = self.client.get("/users/profile/", HTTP_IF_NONE_MATCH=etag, **self.auth())
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"]["user_detail"]["first_name"], "Member")
+
+
+class ChangePasswordTests(AccountsTestCase):
+    def assertPasswordChanged(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password(NEW_PASSWORD))
+
+    def test_json_put(self):
+        response = self.client.put(
+            "/users/changepassword/",
+            {"old_password": "Oldpass@123", "new_password": NEW_PASSWORD},
+            content_type="application/json",
+            **self.auth(),
+        )
+        self.assertPasswordChanged(response)
+
+    def test_form_encoded_put(self):
+        response = self.client.put(
+            "/users/changepassword/",
+            urlencode({"old_password": "Oldpass@123", "new_password": NEW_PASSWORD}),
+            content_type="application/x-www-form-urlencoded",
+            **self.auth(),
+        )
+        self.assertPasswordChanged(response)
+
+    def test_multipart_patch(self):
+        response = self.client.patch(
+            "/users/changepassword/",
+            encode_multipart(BOUNDARY, {"old_password": "Oldpass@123", "new_password": NEW_PASSWORD}),
+            content_type=MULTIPART_CONTENT,
+            **self.auth(),
+        )
+        self.assertPasswordChanged(response)
+
+    def test_wrong_old_password(self):
+        response = self.client.put(
+            "/users/changepassword/",
+            urlencode({"old_password": "Wrong@1234", "new_password": NEW_PASSWORD}),
+            content_type="application/x-www-form-urlencoded",
+            **self.auth(),
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(PASSWORD_HASHERS=[
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.MD5PasswordHasher",
+])
+class PasswordHashingTests(AccountsTestCase):
+    def test_outdated_hash_is_upgraded_from_the_caller(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password("Oldpass@123", hasher="md5"))
+        self.user.refresh_from_db()
+
+        self.assertTrue(async_to_sync(hashing.check_password)(self.user, "Oldpass@123"))
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, "pbkdf2_sha256")
+
+    def test_wrong_password_keeps_the_hash(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password("Oldpass@123", hasher="md5"))
+        self.user.refresh_from_db()
+
+        self.assertFalse(async_to_sync(hashing.check_password)(self.user, "Wrong@1234"))
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, "md5")
+
+
+@override_settings(AUTH_RATE_LIMITS={"login": (3, 60), "onboard": (5, 3600), "otp_verify": (10, 600)})
+class RateLimitTests(AccountsTestCase):
+    def login(self, email="member@x.com", **extra):
+        return self.client.post("/users/login/", {"email": email, "password": "Wrong@1234"}, **extra)
+
+    def test_login_is_limited_per_client(self):
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, 400)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response["Retry-After"]), 1)
+
+    @override_settings(REST_FRAMEWORK={"NUM_PROXIES": 1})
+    def test_clients_behind_a_proxy_get_their_own_bucket(self):
+        for i in range(3):
+            self.login(f"user{i}@x.com", HTTP_X_FORWARDED_FOR="203.0.113.1")
+        self.assertEqual(self.login("user9@x.com", HTTP_X_FORWARDED_FOR="203.0.113.1").status_code, 429)
+        self.assertEqual(self.login("user9@x.com", HTTP_X_FORWARDED_FOR="203.0.113.2").status_code, 404)
+
+    def test_wait_is_at_least_one_second_when_over_the_limit(self):
+        limiter = SlidingWindowLimiter("test", limit=10, window=10)
+        # half of the previous window still counts: 10 * 0.5 + 5 reaches the limit
+        cache.set_many({limiter._key("ip:x", 100): 5, limiter._key("ip:x", 99): 10})
+        with mock.patch("accounts.throttling.time.time", return_value=1005.0):
+            self.assertEqual(limiter.hit("ip:x"), 1)
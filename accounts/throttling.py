@@ -0,0 +1,104 @@
+"""
+Sliding-window rate limiting for the auth and OTP endpoints.
+
+Each identity (client IP, email) gets one counter per fixed window in the
+cache. The sliding count is approximated from the current and the previous
+window, weighting the previous one by how much of it still overlaps the
+sliding window. That is two cache reads and one ``incr`` per check, and
+the check runs before any database or hashing work.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+def get_limit(scope):
+    """``(requests, window seconds)`` allowed per identity for ``scope``, from ``AUTH_RATE_LIMITS``."""
+    return settings.AUTH_RATE_LIMITS[scope]
+
+
+def client_ip(request):
+    """
+    Client address as DRF throttles see it: behind ``NUM_PROXIES`` trusted
+    proxies it is read from ``X-Forwarded-For``, otherwise ``REMOTE_ADDR``.
+    """
+    return BaseThrottle().get_ident(request) or "unknown"
+
+
+class SlidingWindowLimiter:
+    def __init__(self, scope, limit=None, window=None):
+        self.scope = scope
+        if limit is None or window is None:
+            limit, window = get_limit(scope)
+        self.limit = limit
+        self.window = window
+        self.cache = caches[getattr(settings, "AUTH_RATE_LIMIT_CACHE", "default")]
+
+    def _key(self, identity, index):
+        return f"rl:{self.scope}:{identity}:{index}"
+
+    def hit(self, *identities):
+        """
+        Count a request for every identity and return 0, or the seconds to
+        wait when any of them is over the limit (nothing is counted then).
+        """
+        now = time.time()
+        index = int(now // self.window)
+        elapsed = (now % self.window) / self.window
+        keys = {}
+        for identity in identities:
+            if identity:
+                keys[identity] = (self._key(identity, index), self._key(identity, index - 1))
+        counts = self.cache.get_many([key for pair in keys.values() for key in pair])
+
+        over = False
+        wait = 0
+        for current, previous in keys.values():
+            count_now, count_before = counts.get(current, 0), counts.get(previous, 0)
+            if count_before * (1 - elapsed) + count_now >= self.limit:
+                over = True
+                # when enough of the previous window has slid out
+                if count_now < self.limit and count_before:
+                    needed = 1 - (self.limit - count_now) / count_before
+                    wait = max(wait, math.ceil((needed - elapsed) * self.window))
+                else:
+                    wait = max(wait, math.ceil((1 - elapsed) * self.window))
+        if over:
+            # rounding can bring the wait down to 0 for a caller over the limit
+            return max(wait, 1)
+
+        for current, _ in keys.values():
+            # the counter must outlive the next window, it is its "previous"
+            self.cache.add(current, 0, 2 * self.window)
+            try:
+                self.cache.incr(current)
+            except ValueError:
+                self.cache.set(current, 1, 2 * self.window)
+        return 0
+
+
+class AuthRateThrottle(BaseThrottle):
+    """DRF throttle keyed by client IP and the ``email`` of the request body."""
+
+    scope = None
+
+    def allow_request(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        identities = [f"ip:{client_ip(request)}"]
+        if isinstance(email, str) and email.strip():
+            identities.append(f"email:{email.strip().lower()}")
+        self.retry_after = SlidingWindowLimiter(self.scope).hit(*identities)
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
+
+
+class OnboardRateThrottle(AuthRateThrottle):
+    scope = "onboard"
+
+
+class OTPVerifyRateThrottle(AuthRateThrottle):
+    scope = "otp_verify"
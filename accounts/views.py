@@ -12,63 +12,132 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 
-from rest_framework.generics import UpdateAPIView
-
-
-class ChangePasswordView(UpdateAPIView):
-    serializer_class = ChangePasswordSerializer
-    model = User
-    permission_classes = [IsAuthenticated]
-    
-    def get_object(self, queryset=None):
-        obj = self.request.user
-        return obj
-    
-    def update(self, request, *args, **kwargs):
-        user = self.get_object()
-        serializer = self.get_serializer(data=request.data)
-        
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, QueryDict
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+import io
+import json
+from django.http.multipartparser import MultiPartParser, MultiPartParserError
+from accounts import hashing
+from accounts.authentication import CachedJWTAuthentication
+from accounts.cache import get_profile_cache_ttl, profile_cache_key, profile_etag
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from accounts.throttling import SlidingWindowLimiter, client_ip
+
+
+def _request_data(request):
+    """
+    JSON or form body of a plain Django request. Django only parses forms
+    for POST, so PUT/PATCH bodies are parsed here.
+    """
+    if request.content_type == "application/json":
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+    if request.method == "POST":
+        return request.POST
+    if request.content_type == "multipart/form-data":
+        try:
+            return MultiPartParser(
+                request.META, io.BytesIO(request.body), request.upload_handlers, request.encoding
+            ).parse()[0]
+        except MultiPartParserError:
+            return None
+    return QueryDict(request.body, encoding=request.encoding)
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag in etags
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ChangePasswordView(View):
+    """
+    PUT/PATCH: change the password of the authenticated user. Async, the
+    old password check and the new hash run in the password hashing pool.
+    """
+
+    async def put(self, request, *args, **kwargs):
+        try:
+            auth = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+        except (AuthenticationFailed, InvalidToken) as exc:
+            detail = exc.detail.get("detail", "") if isinstance(exc.detail, dict) else exc.detail
+            return JsonResponse({"status": "failed", "message": str(detail)}, status=status.HTTP_401_UNAUTHORIZED)
+        if auth is None:
+            response = {"status": "failed", "message": "Authentication credentials were not provided."}
+            return JsonResponse(response, status=status.HTTP_401_UNAUTHORIZED)
+        user = auth[0]
+
+        serializer = ChangePasswordSerializer(data=_request_data(request))
         if serializer.is_valid():
-            if not user.check_password(serializer.data.get('old_password')):
+            if not await hashing.check_password(user, serializer.data.get('old_password')):
                 response = {
                     'status': 'failed',
                     'message': 'Old password is incorrect'
                 }
-                return Response(response, status=status.HTTP_400_BAD_REQUEST)
-            
-            user.set_password(serializer.data.get('new_password'))
-            user.save()
+                return JsonResponse(response, status=status.HTTP_400_BAD_REQUEST)
+
+            await hashing.set_password(user, serializer.data.get('new_password'))
+            await user.asave(update_fields=["password", "last_modified"])
             response = {
                 'status': 'success',
                 'message': 'Password updated successfully'
             }
-            return Response(response, status=status.HTTP_200_OK)
-        
+            return JsonResponse(response, status=status.HTTP_200_OK)
+
         response = {
             'status': 'failed',
             'message': 'Password update failed',
             'errors': serializer.errors
         }
-        return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse(response, status=status.HTTP_400_BAD_REQUEST)
 
+    patch = put
 
 
 class ProfileViewSet(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        """Return user profile with nested UserDetail if available."""
-        serializer = ProfileSerializer(request.user)
+        """
+        Return user profile with nested UserDetail if available.
+
+        The payload is cached per user with a strong ETag; a matching
+        ``If-None-Match`` gets a 304 without serializing the profile.
+        """
+        user = request.user
+        key = profile_cache_key(user.pk)
+        entry = cache.get(key)
+        if entry is None:
+            detail = user.user_detail
+            etag = profile_etag(user, detail.last_modified if detail else None)
+            if _etag_matches(request, etag):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+            entry = {"etag": etag, "data": dict(ProfileSerializer(user).data)}
+            cache.set(key, entry, get_profile_cache_ttl())
+        elif _etag_matches(request, entry["etag"]):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry["etag"]})
+
         return Response(
             {
                 "status": "success",
                 "message": "User profile fetched successfully",
-                "data": serializer.data,
+                "data": entry["data"],
             },
             status=status.HTTP_200_OK,
+            headers={"ETag": entry["etag"]},
         )
 
     def post(self, request):
@@ -116,33 +185,44 @@ class ProfileViewSet(APIView):
         )
 
 
-class LoginViewSet(APIView):
-    permission_classes = [AllowAny]
+@method_decorator(csrf_exempt, name="dispatch")
+class LoginViewSet(View):
+    """POST: email/password login. Async, the password check runs in the password hashing pool."""
 
-    def post(self, request):
-        email = request.data.get("email")
-        password = request.data.get("password")
+    async def post(self, request):
+        data = _request_data(request) or {}
+        email = data.get("email")
+        password = data.get("password")
 
         if not email or not password:
             res = {
                 "status": "failed",
                 "message": "Please provide both email and password",
             }
-            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse(res, status=status.HTTP_400_BAD_REQUEST)
+
+        # rejected before the user lookup and the password hash
+        limiter = SlidingWindowLimiter("login")
+        wait = await sync_to_async(limiter.hit)(f"ip:{client_ip(request)}", f"email:{email.strip().lower()}")
+        if wait:
+            res = {"status": "failed", "message": f"Too many login attempts, try again in {wait} seconds"}
+            response = JsonResponse(res, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response["Retry-After"] = str(wait)
+            return response
 
         try:
-            user = User.objects.get(email=email.lower())
+            user = await User.objects.aget(email=email.lower())
         except User.DoesNotExist:
             res = {"status": "failed", "message": "Account does not exist"}
-            return Response(res, status=status.HTTP_404_NOT_FOUND)
+            return JsonResponse(res, status=status.HTTP_404_NOT_FOUND)
 
-        if not user.check_password(password):
+        if not await hashing.check_password(user, password):
             res = {"status": "failed", "message": "Invalid credentials"}
-            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse(res, status=status.HTTP_400_BAD_REQUEST)
 
         if not user.is_verified:
             res = {"status": "failed", "message": "Please verify your email first"}
-            return Response(res, status=status.HTTP_403_FORBIDDEN)
+            return JsonResponse(res, status=status.HTTP_403_FORBIDDEN)
 
         refresh = RefreshToken.for_user(user)
         user_data = LoginSerializer(user).data
@@ -156,4 +236,4 @@ class LoginViewSet(APIView):
                 "user": user_data,
             },
         }
-        return Response(res, status=status.HTTP_200_OK)
+        return JsonResponse(res, status=status.HTTP_200_OK)
@@ -113,6 +113,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'alumniconnect.wsgi.application'
+ASGI_APPLICATION = 'alumniconnect.asgi.application'
 
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -120,13 +121,35 @@ AUTH_USER_MODEL = 'accounts.User'
 # Email Settings
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
-EMAIL_HOST = "smtp.gmail.com"
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+# point EMAIL_HOST/EMAIL_PORT at a local SMTP sink (EMAIL_USE_TLS=FALSE) to test delivery
+EMAIL_HOST = os.getenv('EMAIL_HOST', "smtp.gmail.com")
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'TRUE') == 'TRUE'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Email outbox
+# messages sent per SMTP connection by send_queued_emails
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 100))
+# attempts before a message is marked failed
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# seconds before the first retry, doubled on every further attempt
+EMAIL_OUTBOX_RETRY_DELAY = 30
+# seconds a claimed batch stays locked before another worker may pick it up
+EMAIL_OUTBOX_LOCK_TIMEOUT = 5 * 60
+# messages per second a send_queued_emails worker may send, 0 for no limit
+EMAIL_OUTBOX_RATE = float(os.getenv('EMAIL_OUTBOX_RATE', 0))
+# days sent messages are kept before purge_sent_emails deletes them
+EMAIL_OUTBOX_RETENTION_DAYS = 30
+
+# Invitations
+INVITATION_URL = os.getenv('INVITATION_URL', "https://alumniconnect.com/join/{token}")
+# recipients invited per batch (tokens, rendering and outbox inserts)
+INVITATION_BATCH_SIZE = 2000
+# processes rendering invitation emails, defaults to the CPU count
+INVITATION_RENDER_WORKERS = int(os.getenv('INVITATION_RENDER_WORKERS', 0)) or None
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -151,12 +174,15 @@ DATABASES = {
 }
 
 # cache
-# CACHES = {
-#     'default': {
-#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-#         'LOCATION': os.getenv('REDIS_HOST'),
-#     }
-# }
+# the cache is shared by the web and worker processes, so use redis when it
+# is configured and fall back to the per-process memory cache in development
+if os.getenv('REDIS_HOST'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_HOST'),
+        }
+    }
 
 # Channels
 # ASGI_APPLICATION = "alumniconnect.asgi.application"
@@ -175,9 +201,42 @@ DATABASES = {
 # JWT authentication
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
+    # reverse proxies/CDN hops in front of the app; client IPs (rate limits)
+    # are then read from X-Forwarded-For instead of the proxy's address
+    "NUM_PROXIES": int(os.getenv('NUM_PROXIES', 0)),
+}
+
+# seconds an authenticated user is served from cache; saving the user drops
+# the entry, changes made with queryset updates apply once it expires
+AUTH_USER_CACHE_TTL = 15
+
+# seconds a profile payload is served from cache; saving the user or its
+# detail drops the entry
+PROFILE_CACHE_TTL = 10 * 60
+
+# threads hashing passwords for the async login/change password views,
+# defaults to the CPU count
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0)) or None
+
+# (requests, window seconds) per client IP and per email for the auth endpoints
+AUTH_RATE_LIMITS = {
+    "login": (10, 60),
+    "onboard": (5, 60 * 60),
+    "otp_verify": (10, 10 * 60),
 }
+# cache alias holding the rate limit counters
+AUTH_RATE_LIMIT_CACHE = "default"
+
+# One-time passwords
+OTP_STORE = "accounts.otp.CacheOTPStore"
+# cache alias holding OTPs, use a shared cache (Redis) with several web workers
+OTP_CACHE = "default"
+# seconds an OTP stays valid
+OTP_TTL = 10 * 60
+# wrong guesses before an OTP is dropped
+OTP_MAX_ATTEMPTS = 5
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=4),
@@ -187,6 +246,46 @@ SIMPLE_JWT = {
 }
 
 
+# Alumni import
+# rows per bulk insert while staging an uploaded sheet
+ALUMNI_IMPORT_CHUNK_SIZE = int(os.getenv('ALUMNI_IMPORT_CHUNK_SIZE', 2000))
+# rows per compressed chunk for imports staged in the columnar format
+ALUMNI_IMPORT_COLUMNAR_CHUNK_ROWS = 5000
+# rows promoted per transaction by the import worker
+ALUMNI_IMPORT_BATCH_SIZE = int(os.getenv('ALUMNI_IMPORT_BATCH_SIZE', 1000))
+# seconds a worker holds an import without renewing (renewed every batch),
+# after that another run_alumni_import may take the job over
+ALUMNI_IMPORT_LEASE = 5 * 60
+# processes used to validate staged rows, defaults to the CPU count
+ALUMNI_IMPORT_VALIDATION_WORKERS = int(os.getenv('ALUMNI_IMPORT_VALIDATION_WORKERS', 0)) or None
+# staged rows read per validation pass
+ALUMNI_IMPORT_VALIDATION_WINDOW = int(os.getenv('ALUMNI_IMPORT_VALIDATION_WINDOW', 20000))
+# seconds a cached progress snapshot is kept
+ALUMNI_IMPORT_PROGRESS_TTL = 60 * 60
+# rows fetched per query when streaming an error report
+ALUMNI_IMPORT_EXPORT_CHUNK_SIZE = 2000
+# rows written/deleted per batch when archiving finished imports
+ALUMNI_IMPORT_ARCHIVE_BATCH_SIZE = 5000
+# finished imports older than this many days are archived by archive_alumni_imports
+ALUMNI_IMPORT_ARCHIVE_AFTER_DAYS = int(os.getenv('ALUMNI_IMPORT_ARCHIVE_AFTER_DAYS', 30))
+# minimum score for two members to be reported as the same person
+ALUMNI_DUPLICATE_THRESHOLD = 0.6
+# members sharing a blocking key beyond this are not compared (key too common)
+ALUMNI_DUPLICATE_MAX_BLOCK = 50
+
+# Colleges
+# seconds a public college page is served from cache; changes to the college,
+# its address or its social links drop the entry
+COLLEGE_CACHE_TTL = 5 * 60
+# seconds browsers and shared caches (CDN, reverse proxy) may reuse a college page
+COLLEGE_HTTP_MAX_AGE = 60
+# colleges per directory page by default, and the most a client may ask for
+DIRECTORY_PAGE_SIZE = 20
+DIRECTORY_MAX_PAGE_SIZE = 100
+# search matches ranked per query, the rest of a very broad prefix is not ranked
+COLLEGE_SEARCH_CANDIDATES = 1000
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,135 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Max
+from django.test.utils import override_settings
+
+from emails.models import OutboundEmail
+from emails.outbox import drain
+from emails.sink import SMTPSink
+from emails.utils import invite_context, send_admin_onboarding_otp, send_invite_mail
+
+
+def _producer(volume, enqueue_rate, done, errors):
+    """Queue ``volume`` messages at ``enqueue_rate`` per second, like requests arriving."""
+    start = time.monotonic()
+    try:
+        for i in range(volume):
+            delay = start + i / enqueue_rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if i % 10:
+                send_invite_mail(f"member{i}@bench.invalid", invite_context(f"Member {i}", "Bench College", f"t{i}"))
+            else:
+                send_admin_onboarding_otp(f"admin{i}@bench.invalid", f"{i % 1000000:06d}")
+    except Exception as exc:
+        errors.append(exc)
+    finally:
+        done.set()
+        connection.close()
+
+
+def _worker(batch_size, rate, poll, done, errors):
+    """Drain the outbox while the producer runs, like ``send_queued_emails --loop``."""
+    try:
+        while True:
+            finished = done.is_set()
+            sent, failed = drain(batch_size=batch_size, rate=rate)
+            if finished and not sent and not failed:
+                break
+            if not sent and not failed:
+                time.sleep(poll)
+    except Exception as exc:
+        errors.append(exc)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark email delivery against a local SMTP sink: a producer queues messages through the "
+        "emails.utils senders at a fixed rate while N workers drain the outbox, and the run reports "
+        "messages/sec, connection reuse and the latency from when a message became claimable to its "
+        "delivery. Run it against a scratch database with an empty outbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--volumes", type=int, nargs="+", default=[100, 1000, 10000], help="Messages per run")
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Outbox worker counts to try")
+        parser.add_argument("--batch-size", type=int, default=None, help="Messages per SMTP connection")
+        parser.add_argument("--rate", type=float, default=0, help="Messages per second per worker, 0 for no limit")
+        parser.add_argument(
+            "--enqueue-rate", type=float, default=200, help="Messages per second queued while the workers drain"
+        )
+        parser.add_argument("--poll", type=float, default=0.05, help="Seconds an idle worker waits before polling")
+
+    def handle(self, *args, **options):
+        if OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING).exists():
+            raise CommandError("The outbox has pending messages, they would be sent to the sink")
+
+        with SMTPSink() as sink, override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST=sink.host,
+            EMAIL_PORT=sink.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            DEFAULT_FROM_EMAIL="bench@alumniconnect.invalid",
+        ):
+            self.stdout.write(
+                f"{'workers':>7}{'messages':>10}{'offered/s':>11}{'sent/s':>9}{'conns':>7}"
+                f"{'msgs/conn':>11}{'p50 ms':>9}{'p99 ms':>9}"
+            )
+            for workers in options["workers"]:
+                for volume in options["volumes"]:
+                    self.run(sink, workers, volume, options)
+
+    def run(self, sink, workers, volume, options):
+        sink.reset()
+        start_pk = OutboundEmail.objects.aggregate(last=Max("pk"))["last"] or 0
+
+        done = threading.Event()
+        errors = []
+        threads = [threading.Thread(target=_producer, args=(volume, options["enqueue_rate"], done, errors))]
+        threads += [
+            threading.Thread(
+                target=_worker, args=(options["batch_size"], options["rate"], options["poll"], done, errors)
+            )
+            for _ in range(workers)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        # created_at is when a message became claimable: the latency covers
+        # the wait in the outbox and the delivery, not the enqueueing of others
+        queued = OutboundEmail.objects.filter(pk__gt=start_pk)
+        latencies = sorted(
+            (sink.arrivals[pk] - created_at.timestamp()) * 1000
+            for pk, created_at in queued.values_list("pk", "created_at").iterator(chunk_size=5000)
+            if pk in sink.arrivals
+        )
+        unsent = queued.exclude(status=OutboundEmail.STATUS_SENT).count()
+        queued.delete()
+
+        if errors or unsent:
+            raise CommandError(f"{unsent} messages not delivered: {errors[:1]}")
+        p50, p99 = self.percentiles(latencies)
+        self.stdout.write(
+            f"{workers:>7}{volume:>10}{options['enqueue_rate']:>11.0f}{sink.messages / elapsed:>9.0f}{sink.connections:>7}"
+            f"{sink.messages / max(sink.connections, 1):>11.1f}{p50:>9.0f}{p99:>9.0f}"
+        )
+
+    def percentiles(self, latencies):
+        if len(latencies) < 2:
+            value = latencies[0] if latencies else 0
+            return value, value
+        cuts = statistics.quantiles(latencies, n=100)
+        return cuts[49], cuts[98]
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from emails.rendering import get_email_template
+from emails.utils import INVITE_TEMPLATE, invite_context
+
+
+def baseline(name, contexts):
+    bodies = []
+    for context in contexts:
+        html = render_to_string(name, context)
+        bodies.append((strip_tags(html), html))
+    return bodies
+
+
+class Command(BaseCommand):
+    help = "Compare render_to_string + strip_tags with compiled email templates on a batch of invites"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=5000)
+        parser.add_argument("--template", default=INVITE_TEMPLATE)
+
+    def handle(self, *args, **options):
+        count = options["messages"]
+        contexts = [
+            # covers the variables of both email templates
+            dict(invite_context(f"Member {i} O'Neil & Co", "ABC <College>", f"token{i:08d}"), otp_code=f"{i:06d}")
+            for i in range(count)
+        ]
+
+        start = time.perf_counter()
+        expected = baseline(options["template"], contexts)
+        slow = time.perf_counter() - start
+
+        start = time.perf_counter()
+        template = get_email_template(options["template"])
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bodies = template.render_many(contexts)
+        fast = time.perf_counter() - start
+
+        if bodies != expected:
+            raise CommandError("Compiled rendering does not match render_to_string + strip_tags")
+
+        self.stdout.write(f"{count} messages of {options['template']} (text skeleton: {template.static})")
+        self.stdout.write(f"render_to_string + strip_tags: {slow * 1e6 / count:8.1f} us/message")
+        self.stdout.write(f"compiled template:             {fast * 1e6 / count:8.1f} us/message")
+        self.stdout.write(f"one-time compile:              {compile_time * 1e3:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"speedup: {slow / fast:.1f}x"))
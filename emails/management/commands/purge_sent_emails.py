@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from emails.outbox import purge_sent
+
+
+class Command(BaseCommand):
+    help = "Delete sent emails from the outbox once they are past the retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=None,
+            help="Days since a message was sent (default: EMAIL_OUTBOX_RETENTION_DAYS)",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_sent(options["older_than"])
+        self.stdout.write(f"{deleted} sent emails deleted")
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from emails.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox, one SMTP connection per batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None, help="Messages per SMTP connection")
+        parser.add_argument(
+            "--rate", type=float, default=None, help="Messages per second (default: EMAIL_OUTBOX_RATE, 0 for no limit)"
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep polling the outbox instead of exiting")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = drain(batch_size=options["batch_size"], rate=options["rate"])
+            if sent or failed or not options["loop"]:
+                self.stdout.write(f"{sent} sent, {failed} failed")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
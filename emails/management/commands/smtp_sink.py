@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from emails.sink import SMTPSink
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a local SMTP server that accepts and discards mail. Point EMAIL_HOST/EMAIL_PORT at it "
+        "with EMAIL_USE_TLS=FALSE to exercise delivery without a real mail account."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=1025)
+
+    def handle(self, *args, **options):
+        sink = SMTPSink(options["host"], options["port"]).start()
+        self.stdout.write(f"SMTP sink listening on {sink.host}:{sink.port}, Ctrl-C to stop")
+        try:
+            seen = 0
+            while True:
+                time.sleep(5)
+                if sink.messages != seen:
+                    seen = sink.messages
+                    self.stdout.write(f"{sink.messages} messages over {sink.connections} connections")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sink.stop()
@@ -0,0 +1,221 @@
+"""
+Database backed email outbox.
+
+``enqueue`` stores a message in ``OutboundEmail`` and returns at once, so a
+request never waits for an SMTP handshake. ``drain`` claims due messages in
+batches and sends each batch over one SMTP connection, retrying failures
+with exponential backoff.
+
+Delivery is at least once: a batch is marked sent after its last message,
+so a worker that dies mid-batch, or whose lock times out while it is still
+sending, leaves messages that are sent again by the next claim. Sent rows
+are kept ``EMAIL_OUTBOX_RETENTION_DAYS`` for auditing and then removed by
+``purge_sent``; sensitive messages (OTPs) have their body blanked as soon
+as they are sent.
+"""
+import datetime as dt
+import smtplib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.utils import timezone
+
+from emails.models import OutboundEmail
+
+
+def get_batch_size(batch_size=None):
+    return batch_size or getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 100)
+
+
+def retry_delay(attempts):
+    """Seconds to wait after the ``attempts``-th failed attempt."""
+    base = getattr(settings, "EMAIL_OUTBOX_RETRY_DELAY", 30)
+    return min(base * 2 ** (attempts - 1), 6 * 60 * 60)
+
+
+def enqueue(subject, body, to, html=None, from_email=None, sensitive=False):
+    """
+    Queue a message for delivery and return the ``OutboundEmail``.
+    ``sensitive`` bodies (OTPs) are blanked once the message is sent.
+    """
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        html=html,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+        sensitive=sensitive,
+    )
+
+
+def enqueue_many(messages, batch_size=1000):
+    """
+    Queue many messages with bulk inserts. ``messages`` is an iterable of
+    dicts with the arguments of ``enqueue``; returns the number queued.
+    """
+    queued = 0
+    buffer = []
+    for message in messages:
+        buffer.append(
+            OutboundEmail(
+                subject=message["subject"],
+                body=message["body"],
+                html=message.get("html"),
+                from_email=message.get("from_email") or settings.DEFAULT_FROM_EMAIL,
+                to=list(message["to"]),
+                sensitive=message.get("sensitive", False),
+            )
+        )
+        if len(buffer) >= batch_size:
+            OutboundEmail.objects.bulk_create(buffer)
+            queued += len(buffer)
+            buffer = []
+    OutboundEmail.objects.bulk_create(buffer)
+    return queued + len(buffer)
+
+
+class Pacer:
+    """Spaces out sends so a worker stays under ``rate`` messages per second."""
+
+    def __init__(self, rate=None):
+        rate = getattr(settings, "EMAIL_OUTBOX_RATE", 0) if rate is None else rate
+        self.interval = 1 / rate if rate else 0
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if now < self.next_at:
+            time.sleep(self.next_at - now)
+        self.next_at = max(now, self.next_at) + self.interval
+
+
+def to_message(email, connection=None):
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.body,
+        email.from_email,
+        email.to,
+        connection=connection,
+        headers={"X-Outbox-Id": str(email.pk)},
+    )
+    if email.html:
+        message.attach_alternative(email.html, "text/html")
+    return message
+
+
+def claim_batch(batch_size=None):
+    """
+    Lock up to ``batch_size`` due messages for this worker and return them.
+    A worker that dies keeps its claim only until the lock times out, then
+    the messages are due again.
+    """
+    now = timezone.now()
+    due = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+    pks = list(due.order_by("next_attempt_at", "pk").values_list("pk", flat=True)[:get_batch_size(batch_size)])
+    if not pks:
+        return []
+
+    claim = uuid.uuid4()
+    lock = dt.timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_LOCK_TIMEOUT", 5 * 60))
+    due.filter(pk__in=pks).update(claim=claim, next_attempt_at=now + lock)
+    return list(OutboundEmail.objects.filter(claim=claim).order_by("pk"))
+
+
+def _failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error) or type(error).__name__
+    if email.attempts >= getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5):
+        email.status = OutboundEmail.STATUS_FAILED
+    else:
+        email.next_attempt_at = timezone.now() + dt.timedelta(seconds=retry_delay(email.attempts))
+    email.claim = None
+    email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at", "claim"])
+
+
+def send_batch(emails, pacer=None):
+    """
+    Send claimed messages over a single connection. Returns ``(sent, failed)``
+    where failed messages have been rescheduled or given up on.
+    """
+    pacer = pacer or Pacer(0)
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except (OSError, smtplib.SMTPException) as exc:
+        for email in emails:
+            _failed(email, exc)
+        return 0, len(emails)
+
+    sent, failed = [], 0
+    try:
+        for email in emails:
+            pacer.wait()
+            try:
+                connection.send_messages([to_message(email, connection)])
+            except smtplib.SMTPServerDisconnected as exc:
+                _failed(email, exc)
+                failed += 1
+                # the rest of the batch can still go out on a new connection
+                connection.close()
+                connection.open()
+            except (OSError, smtplib.SMTPException) as exc:
+                _failed(email, exc)
+                failed += 1
+            else:
+                sent.append(email.pk)
+    except (OSError, smtplib.SMTPException) as exc:
+        # reconnecting failed: the messages not tried yet wait for a retry
+        done = set(sent) | {email.pk for email in emails if email.claim is None}
+        for email in emails:
+            if email.pk not in done:
+                _failed(email, exc)
+                failed += 1
+    finally:
+        connection.close()
+
+    delivered = OutboundEmail.objects.filter(pk__in=sent)
+    now = timezone.now()
+    delivered.filter(sensitive=False).update(status=OutboundEmail.STATUS_SENT, sent_at=now, claim=None)
+    delivered.filter(sensitive=True).update(
+        status=OutboundEmail.STATUS_SENT, sent_at=now, claim=None, body="", html=None
+    )
+    return len(sent), failed
+
+
+def drain(batch_size=None, max_batches=None, rate=None):
+    """
+    Send due messages until the outbox is empty; returns ``(sent, failed)``.
+    ``rate`` caps messages per second (default ``EMAIL_OUTBOX_RATE``).
+    """
+    pacer = Pacer(rate)
+    total_sent = total_failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        emails = claim_batch(batch_size)
+        if not emails:
+            break
+        sent, failed = send_batch(emails, pacer)
+        total_sent += sent
+        total_failed += failed
+        batches += 1
+    return total_sent, total_failed
+
+
+def purge_sent(days=None, batch_size=1000):
+    """
+    Delete messages sent more than ``days`` ago (default
+    ``EMAIL_OUTBOX_RETENTION_DAYS``); returns the number deleted.
+    """
+    if days is None:
+        days = getattr(settings, "EMAIL_OUTBOX_RETENTION_DAYS", 30)
+    cutoff = timezone.now() - dt.timedelta(days=days)
+    old = OutboundEmail.objects.filter(status=OutboundEmail.STATUS_SENT, sent_at__lt=cutoff)
+    deleted = 0
+    while True:
+        pks = list(old.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        deleted += OutboundEmail.objects.filter(pk__in=pks).delete()[0]
@@ -0,0 +1,73 @@
+"""
+Compiled email templates.
+
+``render_to_string`` followed by ``strip_tags`` re-parses the whole HTML of
+every message to build its text part. An ``EmailTemplate`` is compiled once
+per process and, when it is made only of text and ``{{ variables }}``, keeps
+the stripped text as a skeleton with a slot per variable: rendering a
+message then only resolves its variables and joins the pieces.
+"""
+import re
+from functools import lru_cache
+
+from django.template import Context
+from django.template.base import TextNode, VariableNode
+from django.template.loader import get_template
+from django.utils.html import strip_tags
+
+# private use characters, never produced by escaped template output
+SLOT = re.compile("\ue000(\\d+)\ue001")
+
+
+class EmailTemplate:
+    def __init__(self, name):
+        self.template = get_template(name).template
+        nodes = list(self.template.nodelist)
+        self.static = all(isinstance(node, (TextNode, VariableNode)) for node in nodes)
+        if not self.static:
+            return
+
+        self.nodes = nodes
+        self.variables = [i for i, node in enumerate(nodes) if isinstance(node, VariableNode)]
+        marked = "".join(
+            node.s if isinstance(node, TextNode) else f"\ue000{i}\ue001" for i, node in enumerate(nodes)
+        )
+        # a variable inside a tag (eg. href) is stripped along with the tag
+        self.skeleton = [int(part) if n % 2 else part for n, part in enumerate(SLOT.split(strip_tags(marked)))]
+
+    def _context(self, context):
+        return Context(context, autoescape=self.template.engine.autoescape)
+
+    def render(self, context):
+        """Return the ``(text, html)`` bodies for ``context``."""
+        if not self.static:
+            html = self.template.render(self._context(context))
+            return strip_tags(html), html
+
+        ctx = self._context(context)
+        with ctx.bind_template(self.template):
+            values = {i: self.nodes[i].render_annotated(ctx) for i in self.variables}
+        html = "".join(values[i] if i in values else node.s for i, node in enumerate(self.nodes))
+        if any("<" in value for value in values.values()):
+            # a |safe value carrying markup, the skeleton does not apply
+            return strip_tags(html), html
+        text = "".join(values[part] if isinstance(part, int) else part for part in self.skeleton)
+        return text, html
+
+    def render_many(self, contexts):
+        return [self.render(context) for context in contexts]
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name):
+    return EmailTemplate(name)
+
+
+def render_email(name, context):
+    """``(text, html)`` of template ``name``; the text part is the stripped HTML."""
+    return get_email_template(name).render(context)
+
+
+def render_many(name, contexts):
+    """Render many contexts with one compiled template."""
+    return get_email_template(name).render_many(contexts)
@@ -0,0 +1,96 @@
+"""
+A local SMTP server that accepts and discards every message.
+
+It stands in for the real SMTP host in benchmarks and local runs: point
+``EMAIL_HOST``/``EMAIL_PORT`` at it with ``EMAIL_USE_TLS=FALSE``. It counts
+connections and records when each message arrived, keyed by the outbox id
+the worker puts in the ``X-Outbox-Id`` header.
+"""
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        sink = self.server.sink
+        with sink.lock:
+            sink.connections += 1
+        self.reply("220 alumniconnect sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command in (b"EHLO", b"HELO"):
+                self.reply("250 alumniconnect sink")
+            elif command == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                self.read_message()
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                # MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+    def read_message(self):
+        outbox_id = None
+        headers = True
+        for line in iter(self.rfile.readline, b""):
+            if line == b".\r\n":
+                break
+            if headers:
+                if line in (b"\r\n", b"\n"):
+                    headers = False
+                elif line.lower().startswith(b"x-outbox-id:"):
+                    outbox_id = int(line.split(b":", 1)[1])
+        self.server.sink.received(outbox_id)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.server = _Server((host, port), _Handler)
+        self.server.sink = self
+        self.host, self.port = self.server.server_address[:2]
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        # outbox id -> arrival time (epoch seconds)
+        self.arrivals = {}
+
+    def received(self, outbox_id):
+        now = time.time()
+        with self.lock:
+            self.messages += 1
+            if outbox_id is not None:
+                self.arrivals[outbox_id] = now
+
+    def reset(self):
+        with self.lock:
+            self.connections = 0
+            self.messages = 0
+            self.arrivals = {}
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,3 +1,74 @@
-from django.test import TestCase
+import datetime as dt
+import io
 
-# Create your tests here.
+from django.core import mail
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.safestring import mark_safe
+
+from emails.models import OutboundEmail
+from emails.outbox import drain, enqueue
+from emails.rendering import get_email_template, render_email
+from emails.sink import SMTPSink
+from emails.utils import INVITE_TEMPLATE, invite_context, send_admin_onboarding_otp, send_invite_mail
+
+
+class OutboxTests(TestCase):
+    def test_otp_body_is_blanked_once_sent(self):
+        send_admin_onboarding_otp("admin@college.com", "482913")
+        send_invite_mail("member@college.com", invite_context("Member", "ABC College", "tok"))
+
+        self.assertEqual(drain(), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertIn("482913", mail.outbox[0].body)
+        otp = OutboundEmail.objects.get(to=["admin@college.com"])
+        self.assertEqual(otp.status, OutboundEmail.STATUS_SENT)
+        self.assertEqual(otp.body, "")
+        self.assertIsNone(otp.html)
+        self.assertNotEqual(OutboundEmail.objects.get(to=["member@college.com"]).body, "")
+
+    def test_purge_deletes_only_old_sent_messages(self):
+        old = enqueue("Old", "body", ["old@college.com"])
+        recent = enqueue("Recent", "body", ["recent@college.com"])
+        pending = enqueue("Pending", "body", ["pending@college.com"])
+        drain()
+        OutboundEmail.objects.filter(pk=old.pk).update(sent_at=timezone.now() - dt.timedelta(days=31))
+        OutboundEmail.objects.filter(pk=pending.pk).update(
+            status=OutboundEmail.STATUS_PENDING, created_at=timezone.now() - dt.timedelta(days=31)
+        )
+
+        call_command("purge_sent_emails", stdout=io.StringIO())
+        self.assertEqual(set(OutboundEmail.objects.values_list("pk", flat=True)), {recent.pk, pending.pk})
+
+
+class RenderingTests(SimpleTestCase):
+    def assertRendersLikeDjango(self, name, context):
+        html = render_to_string(name, context)
+        self.assertEqual(render_email(name, context), (strip_tags(html), html))
+
+    def test_compiled_template_matches_render_to_string(self):
+        self.assertTrue(get_email_template(INVITE_TEMPLATE).static)
+        self.assertRendersLikeDjango(INVITE_TEMPLATE, invite_context("Tom & <Jerry>", "ABC College", "tok"))
+        self.assertRendersLikeDjango(INVITE_TEMPLATE, invite_context(mark_safe("<b>Tom</b>"), "ABC College", "tok"))
+        self.assertRendersLikeDjango("emails/admin_onboarding_otp.html", {"otp_code": "482913", "current_year": 2026})
+
+
+class SMTPSinkTests(TestCase):
+    def test_drain_reuses_one_connection_per_batch(self):
+        emails = [enqueue("Hello", "body", [f"user{i}@college.com"]) for i in range(5)]
+        with SMTPSink() as sink, override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST=sink.host,
+            EMAIL_PORT=sink.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        ):
+            self.assertEqual(drain(batch_size=2), (5, 0))
+
+        self.assertEqual((sink.messages, sink.connections), (5, 3))
+        self.assertEqual(set(sink.arrivals), {email.pk for email in emails})
@@ -1,8 +1,10 @@
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 from datetime import datetime
-from alumniconnect.settings import EMAIL_HOST_USER as sender
+from alumniconnect.settings import EMAIL_HOST_USER as sender, INVITATION_URL
+from emails.outbox import enqueue
+from emails.rendering import render_email
+
+INVITE_SUBJECT = "You're Invited to Join Alumni Connect"
+INVITE_TEMPLATE = "emails/invite_member.html"
 
 
 def send_admin_onboarding_otp(to_email, otp_code):
@@ -12,31 +14,22 @@ def send_admin_onboarding_otp(to_email, otp_code):
         "current_year": datetime.now().year,
     }
 
-    html_content = render_to_string("emails/admin_onboarding_otp.html", context)
-    text_content = strip_tags(html_content)
+    text_content, html_content = render_email("emails/admin_onboarding_otp.html", context)
 
-    email = EmailMultiAlternatives(
-        subject, text_content, sender, [to_email]
-    )
-    email.attach_alternative(html_content, "text/html")
-    email.send()
+    enqueue(subject, text_content, [to_email], html=html_content, from_email=sender, sensitive=True)
 
-def send_invite_mail(to_email, otp_code):
-    context = {
-        "member_name": "Alice Smith",
-        "college_name": "ABC College",
-        "invitation_link": "https://alumniconnect.com/join/abc123",
+def invite_context(member_name, college_name, token):
+    return {
+        "member_name": member_name,
+        "college_name": college_name,
+        "invitation_link": INVITATION_URL.format(token=token),
         "current_year": datetime.now().year
     }
 
-    subject="You're Invited to Join Alumni Connect"
-    
-
-    html_content = render_to_string("emails/invite_member.html", context)
-    text_content = strip_tags(html_content)
+def render_invite(context):
+    """Return the ``(text, html)`` bodies of an invitation email."""
+    return render_email(INVITE_TEMPLATE, context)
 
-    email = EmailMultiAlternatives(
-        subject, text_content, sender, [to_email]
-    )
-    email.attach_alternative(html_content, "text/html")
-    email.send()
+def send_invite_mail(to_email, context):
+    text_content, html_content = render_invite(context)
+    enqueue(INVITE_SUBJECT, text_content, [to_email], html=html_content, from_email=sender)
@@ -1,4 +1,4 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import (
     Address,
     College,
@@ -9,7 +9,13 @@ from .models import (
     AcademicRecord,
     AlumniImport,
     ImportedAlumniRow,
+    ImportedRowChunk,
+    DirectoryCounter,
+    DuplicateCandidate,
+    Invitation,
 )
+from .imports.dryrun import preview_import
+from .imports.readers import UnsupportedFileError
 
 class EnrollmentInline(admin.TabularInline):
     model = Enrollment
@@ -101,8 +107,24 @@ class AlumniImportAdmin(admin.ModelAdmin):
     list_display = ("id", "college", "uploaded_by", "status", "total_rows", "processed_rows", "created_at")
     list_filter = ("status", "college")
     search_fields = ("college__name", "uploaded_by__user__email")
-    readonly_fields = ("created_at",)
+    readonly_fields = ("created_at", "started_at", "finished_at", "archived_at", "summary")
     inlines = [ImportedAlumniRowInline]
+    actions = ["preview"]
+
+    @admin.action(description="Preview selected imports (dry run)")
+    def preview(self, request, queryset):
+        for job in queryset.select_related("college"):
+            try:
+                counts = preview_import(job)
+            except UnsupportedFileError as exc:
+                self.message_user(request, f"Import {job.pk}: {exc}", messages.ERROR)
+                continue
+            self.message_user(
+                request,
+                f"Import {job.pk}: {counts['rows']} rows, {counts['new_users']} new users, "
+                f"{counts['existing_users']} existing users, {counts['new_memberships']} new memberships, "
+                f"{counts['new_enrollments']} new enrollments, {counts['invalid']} invalid",
+            )
 
 
 @admin.register(ImportedAlumniRow)
@@ -111,3 +133,48 @@ class ImportedAlumniRowAdmin(admin.ModelAdmin):
     list_filter = ("processed", "success")
     search_fields = ("import_job__id", "row_number")
     readonly_fields = ("created_at",)
+
+
+@admin.register(ImportedRowChunk)
+class ImportedRowChunkAdmin(admin.ModelAdmin):
+    list_display = ("import_job", "first_row", "last_row", "row_count", "processed", "created_at")
+    list_filter = ("processed",)
+    search_fields = ("import_job__id",)
+    exclude = ("data",)
+    readonly_fields = ("created_at",)
+
+
+@admin.register(Invitation)
+class InvitationAdmin(admin.ModelAdmin):
+    list_display = ("email", "name", "college", "role", "created_at", "accepted_at")
+    list_filter = ("role", "college")
+    search_fields = ("email", "name", "college__name")
+    readonly_fields = ("token", "created_at", "accepted_at")
+    raw_id_fields = ("import_job",)
+
+
+@admin.register(DirectoryCounter)
+class DirectoryCounterAdmin(admin.ModelAdmin):
+    list_display = ("key", "value", "updated_at")
+    readonly_fields = ("updated_at",)
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    list_display = ("user", "other", "college", "group", "score", "reasons", "status", "updated_at")
+    list_filter = ("status", "college")
+    search_fields = ("user__email", "other__email", "college__name")
+    readonly_fields = ("created_at", "updated_at")
+    raw_id_fields = ("user", "other")
+    ordering = ("group", "-score")
+    actions = ["mark_merged", "dismiss"]
+
+    @admin.action(description="Mark selected pairs as merged")
+    def mark_merged(self, request, queryset):
+        updated = queryset.update(status=DuplicateCandidate.STATUS_MERGED)
+        self.message_user(request, f"{updated} pairs marked as merged")
+
+    @admin.action(description="Dismiss selected pairs (not duplicates)")
+    def dismiss(self, request, queryset):
+        updated = queryset.update(status=DuplicateCandidate.STATUS_DISMISSED)
+        self.message_user(request, f"{updated} pairs dismissed")
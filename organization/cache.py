@@ -0,0 +1,62 @@
+"""
+Read-through cache of public college pages, keyed by handle.
+
+A miss loads the college with its address and social links in two queries
+and stores the serialized payload along with ``updated_at``, the validator
+of the page. Changes to the address or social links touch ``updated_at``
+of their colleges (``touch_colleges``), so one timestamp covers the whole
+page; the signals in ``organization.signals`` also drop the cached entry.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from organization.models import College
+from organization.serializers import CollegeSerializer
+
+
+def college_cache_key(handle):
+    return f"organization:college:{handle}"
+
+
+def get_college_cache_ttl():
+    return getattr(settings, "COLLEGE_CACHE_TTL", 5 * 60)
+
+
+def invalidate_colleges(handles):
+    cache.delete_many([college_cache_key(handle) for handle in handles])
+
+
+def touch_colleges(colleges):
+    """Mark the colleges of queryset ``colleges`` as changed now and drop their pages."""
+    handles = list(colleges.values_list("handle", flat=True))
+    if handles:
+        College.objects.filter(handle__in=handles).update(updated_at=timezone.now())
+        invalidate_colleges(handles)
+
+
+def get_college_modified(handle):
+    """``updated_at`` of the college, from its cached page when there is one."""
+    entry = cache.get(college_cache_key(handle))
+    if entry is not None:
+        return entry["modified"]
+    return College.objects.filter(handle=handle).values_list("updated_at", flat=True).first()
+
+
+def get_college_page(handle):
+    """
+    ``{"modified": updated_at, "data": serialized college}`` for ``handle``,
+    or None when there is no such college.
+    """
+    key = college_cache_key(handle)
+    entry = cache.get(key)
+    if entry is not None:
+        return entry
+
+    try:
+        college = College.objects.select_related("address").prefetch_related("socials").get(handle=handle)
+    except College.DoesNotExist:
+        return None
+    entry = {"modified": college.updated_at, "data": dict(CollegeSerializer(college).data)}
+    cache.set(key, entry, get_college_cache_ttl())
+    return entry
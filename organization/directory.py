@@ -0,0 +1,121 @@
+"""
+College and member directories: keyset pagination and approximate totals.
+
+Colleges are read in ``(name, handle)`` order, the order of the
+``colleges(name, handle)`` index, and members of a college newest first by
+id, which the ``members(college, role)`` index already ends with. The
+cursor holds the last row of the previous page and the next page seeks
+past it, so any page costs the same as the first one; there is no OFFSET
+to walk through.
+
+Totals come from ``DirectoryCounter`` rows, one per ``(status, is_deleted)``
+bucket, moved by the signals in ``organization.signals``.
+"""
+import base64
+import json
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Prefetch, Q
+
+from organization.models import College, DirectoryCounter, Enrollment
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """The ``size`` values stored in ``cursor``, raises ``InvalidCursor``."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor(cursor)
+    return values
+
+
+def seek_colleges(colleges, cursor):
+    """Colleges of ``colleges`` after ``cursor`` in ``(name, handle)`` order."""
+    colleges = colleges.order_by("name", "handle")
+    if not cursor:
+        return colleges
+    name, handle = decode_cursor(cursor, 2)
+    # name__gte lets the database seek the index, the rest breaks ties on the handle
+    return colleges.filter(Q(name__gte=name), Q(name__gt=name) | Q(handle__gt=handle))
+
+
+def college_page(colleges, cursor, size):
+    """``(colleges, next cursor or None)`` of one directory page."""
+    rows = list(seek_colleges(colleges, cursor)[: size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor([rows[-1].name, rows[-1].handle])
+
+
+def member_page(members, cursor, size):
+    """
+    ``(members, next cursor or None)`` of one page of queryset ``members``,
+    with users, their details and enrollments (with courses) loaded in two
+    queries whatever the page size.
+    """
+    members = members.select_related("user__user_detail").prefetch_related(
+        Prefetch("enrollments", queryset=Enrollment.objects.select_related("course").order_by("-end_year", "-pk"))
+    ).order_by("-pk")
+    if cursor:
+        (last,) = decode_cursor(cursor, 1)
+        if not isinstance(last, int):
+            raise InvalidCursor(cursor)
+        members = members.filter(pk__lt=last)
+    rows = list(members[: size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor([rows[-1].pk])
+
+
+def counter_key(status, is_deleted):
+    return f"colleges:{status}:{int(bool(is_deleted))}"
+
+
+def bump_counter(key, delta):
+    if DirectoryCounter.objects.filter(key=key).update(value=F("value") + delta):
+        return
+    try:
+        with transaction.atomic():
+            DirectoryCounter.objects.create(key=key, value=delta)
+    except IntegrityError:
+        # created concurrently
+        DirectoryCounter.objects.filter(key=key).update(value=F("value") + delta)
+
+
+def approximate_total(statuses, is_deleted):
+    """Colleges with one of ``statuses`` and the given deleted flag, from the counters."""
+    keys = [counter_key(status, is_deleted) for status in statuses]
+    values = DirectoryCounter.objects.filter(key__in=keys).values_list("value", flat=True)
+    return max(sum(values), 0)
+
+
+def recount():
+    """Rebuild every counter from the colleges table, returns ``{key: count}``."""
+    counts = {
+        counter_key(status, is_deleted): 0
+        for status, _ in College.STATUS_CHOICES
+        for is_deleted in (False, True)
+    }
+    for row in College.objects.order_by().values("status", "is_deleted").annotate(total=Count("pk")):
+        counts[counter_key(row["status"], row["is_deleted"])] = row["total"]
+
+    with transaction.atomic():
+        DirectoryCounter.objects.bulk_create(
+            [DirectoryCounter(key=key, value=value) for key, value in counts.items()],
+            update_conflicts=True,
+            unique_fields=["key"],
+            update_fields=["value", "updated_at"],
+        )
+    return counts
@@ -0,0 +1,147 @@
+"""
+Archival of finished import jobs.
+
+The staged records of a done/failed job are written to a gzip compressed
+JSON lines file next to the upload (``MEDIA_ROOT``), a small summary is kept
+on the AlumniImport, and the rows are removed from the hot tables.
+``archived_at`` is only set once they are all gone; a job with an archive
+file but no ``archived_at`` was interrupted while deleting, and archiving it
+again finishes the deletion from the file already written. An archived job
+can be rehydrated back into ``ImportedAlumniRow`` for audit, which removes
+its archive file.
+"""
+import gzip
+import io
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from organization.imports.columnar import decode_chunk
+from organization.models import AlumniImport, ImportedAlumniRow, ImportedRowChunk
+
+ARCHIVABLE = (AlumniImport.STATUS_DONE, AlumniImport.STATUS_FAILED)
+
+
+class ImportNotArchivable(Exception):
+    pass
+
+
+def get_batch_size():
+    return getattr(settings, "ALUMNI_IMPORT_ARCHIVE_BATCH_SIZE", 5000)
+
+
+def iter_records(job):
+    """Every staged row of ``job`` as a dict, whatever the staging format."""
+    rows = job.rows.order_by("pk").values("row_number", "raw_data", "processed", "success", "message")
+    if job.staging_format != AlumniImport.FORMAT_COLUMNAR:
+        yield from rows.iterator(chunk_size=get_batch_size())
+        return
+
+    # columnar jobs only keep their failed rows as ImportedAlumniRow
+    failed = {row["row_number"]: row for row in rows.iterator(chunk_size=get_batch_size())}
+    for chunk in job.chunks.order_by("first_row").iterator(chunk_size=10):
+        for row_number, data in decode_chunk(chunk):
+            if row_number in failed:
+                yield failed.pop(row_number)
+                continue
+            yield {
+                "row_number": row_number,
+                "raw_data": data,
+                "processed": chunk.processed,
+                "success": True if chunk.processed else None,
+                "message": None,
+            }
+    yield from failed.values()
+
+
+def iter_archive(job):
+    """Records of an archived job, read back from its archive file."""
+    job.archive.open("rb")
+    try:
+        with gzip.open(job.archive.file, "rt", encoding="utf-8") as lines:
+            for line in lines:
+                yield json.loads(line)
+    finally:
+        job.archive.close()
+
+
+def _delete_staged(job):
+    batch_size = get_batch_size()
+    for model, related in ((ImportedAlumniRow, job.rows), (ImportedRowChunk, job.chunks)):
+        while True:
+            pks = list(related.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            model.objects.filter(pk__in=pks).delete()
+
+
+def archive_import(job):
+    """Move the staged rows of a finished job into a compressed archive file."""
+    if job.status not in ARCHIVABLE:
+        raise ImportNotArchivable(f"Import {job.pk} is {job.status}, only done or failed imports can be archived")
+    if job.archived_at:
+        raise ImportNotArchivable(f"Import {job.pk} is already archived")
+
+    if not job.archive:
+        _write_archive(job)
+    _delete_staged(job)
+    job.archived_at = timezone.now()
+    AlumniImport.objects.filter(pk=job.pk).update(archived_at=job.archived_at)
+    return job.summary
+
+
+def _write_archive(job):
+    summary = {"rows": 0, "succeeded": 0, "failed": 0}
+    with tempfile.TemporaryFile() as tmp:
+        with gzip.GzipFile(fileobj=tmp, mode="wb") as gz:
+            text = io.TextIOWrapper(gz, encoding="utf-8")
+            for record in iter_records(job):
+                summary["rows"] += 1
+                if record["success"]:
+                    summary["succeeded"] += 1
+                elif record["success"] is False:
+                    summary["failed"] += 1
+                text.write(json.dumps(record, separators=(",", ":")) + "\n")
+            text.flush()
+            text.detach()
+        tmp.seek(0)
+        job.archive.save(f"import-{job.pk}.jsonl.gz", File(tmp), save=False)
+
+    summary["errors"] = (job.errors or {}).get("rows", {})
+    job.summary = summary
+    AlumniImport.objects.filter(pk=job.pk).update(archive=job.archive.name, summary=summary)
+
+
+def rehydrate_import(job):
+    """Restore the rows of an archived job into ImportedAlumniRow."""
+    if not job.archived_at:
+        raise ImportNotArchivable(f"Import {job.pk} is not archived")
+
+    # leftovers of an interrupted rehydration
+    _delete_staged(job)
+
+    batch_size = get_batch_size()
+    restored = 0
+    buffer = []
+    for record in iter_archive(job):
+        buffer.append(ImportedAlumniRow(import_job=job, **record))
+        if len(buffer) >= batch_size:
+            ImportedAlumniRow.objects.bulk_create(buffer)
+            restored += len(buffer)
+            buffer = []
+    with transaction.atomic():
+        ImportedAlumniRow.objects.bulk_create(buffer)
+        restored += len(buffer)
+        # the rows are back as plain rows, whatever the original format
+        job.archived_at = None
+        job.staging_format = AlumniImport.FORMAT_ROWS
+        AlumniImport.objects.filter(pk=job.pk).update(
+            archive=None, archived_at=None, staging_format=job.staging_format
+        )
+    # the rows are the copy of record again, a later archive writes a new file
+    job.archive.delete(save=False)
+    return restored
@@ -0,0 +1,86 @@
+"""
+Normalization and validation of a single staged alumni row.
+"""
+from django.core.exceptions import ValidationError
+
+from accounts import validators as v
+from organization.models import Membership
+
+ROLES = {role for role, _ in Membership.ROLE_CHOICES}
+
+
+class RowError(Exception):
+    """A staged row that cannot be imported; ``field`` is the error type."""
+
+    def __init__(self, field, message):
+        super().__init__(message)
+        self.field = field
+        self.message = message
+
+    def __str__(self):
+        return f"{self.field}: {self.message}"
+
+
+def error_type(message):
+    """Recover the error type from a message stored on ImportedAlumniRow."""
+    return (message or "").partition(":")[0]
+
+
+def _year(value):
+    return int(value) if value else None
+
+
+def normalize_row(raw):
+    """Map a raw staged row to the fields used for promotion."""
+    def get(key):
+        return (raw.get(key) or "").strip()
+
+    return {
+        "email": get("email").lower(),
+        "first_name": get("first_name"),
+        "last_name": get("last_name"),
+        "phone": get("phone"),
+        "role": get("role").lower() or Membership.ROLE_ALUMNI,
+        "course": get("course"),
+        "specialization": get("specialization") or None,
+        "enrollment_number": get("enrollment_number") or None,
+        "start_year": _year(get("start_year")),
+        "end_year": _year(get("end_year")),
+    }
+
+
+def _check(field, validator, value):
+    try:
+        validator(value)
+    except ValidationError as exc:
+        raise RowError(field, exc.messages[0])
+
+
+def clean_row(raw):
+    """
+    Validate a raw staged row with ``accounts.validators`` and return the
+    normalized data. Raises ``RowError`` for the first invalid field.
+    """
+    try:
+        data = normalize_row(raw)
+    except ValueError:
+        raise RowError("year", "Start and end year must be numbers")
+
+    if not data["email"]:
+        raise RowError("email", "Email is required")
+    _check("email", v.validate_email, data["email"])
+    if data["phone"]:
+        _check("phone", v.validate_phone, data["phone"])
+    if data["first_name"]:
+        _check("first_name", v.validate_first_name, data["first_name"])
+    if data["last_name"]:
+        _check("last_name", v.validate_last_name, data["last_name"])
+    if data["role"] not in ROLES:
+        raise RowError("role", f"Invalid role, require {tuple(sorted(ROLES))}")
+
+    start, end = data["start_year"], data["end_year"]
+    if (start is None) != (end is None):
+        raise RowError("year", "Both start and end year are required")
+    if start is not None and start > end:
+        raise RowError("year", "Start year must not be after end year")
+    return data
@@ -0,0 +1,79 @@
+"""
+Columnar chunk encoding for staged rows (``ImportedRowChunk``).
+
+A chunk stores the column names once in ``header`` and the values column by
+column in a zlib compressed JSON block. Values in a column repeat a lot
+(roles, courses, years), so the block compresses far better than one JSON
+object per row, and decoding a chunk is a single ``json.loads``.
+"""
+import json
+import zlib
+
+from organization.models import ImportedAlumniRow, ImportedRowChunk
+
+
+def encode_chunk(rows):
+    """``[(row_number, data), ...]`` -> ``(header, compressed block)``"""
+    header = []
+    seen = set()
+    for _, data in rows:
+        for key in data:
+            if key not in seen:
+                seen.add(key)
+                header.append(key)
+
+    block = {
+        "rows": [row_number for row_number, _ in rows],
+        "columns": [[data.get(key, "") for _, data in rows] for key in header],
+    }
+    return header, zlib.compress(json.dumps(block, separators=(",", ":")).encode(), 6)
+
+
+def decode_chunk(chunk):
+    """``ImportedRowChunk`` -> ``[(row_number, data), ...]``"""
+    block = json.loads(zlib.decompress(bytes(chunk.data)))
+    columns = list(zip(chunk.header, block["columns"]))
+    return [
+        (row_number, {key: values[i] for key, values in columns})
+        for i, row_number in enumerate(block["rows"])
+    ]
+
+
+def build_chunk(job, rows):
+    header, data = encode_chunk(rows)
+    return ImportedRowChunk(
+        import_job=job,
+        first_row=rows[0][0],
+        last_row=rows[-1][0],
+        row_count=len(rows),
+        header=header,
+        data=data,
+    )
+
+
+def chunk_rows(job, chunk):
+    """Unsaved ImportedAlumniRow instances for the rows of a chunk."""
+    return [
+        ImportedAlumniRow(import_job=job, row_number=row_number, raw_data=data)
+        for row_number, data in decode_chunk(chunk)
+    ]
+
+
+def read_row(job, row_number):
+    """
+    Raw data of a single staged row, whatever the staging format, or None.
+    Columnar jobs find the chunk through the ``(import_job, first_row)``
+    index and decode only that chunk.
+    """
+    row = job.rows.filter(row_number=row_number).values_list("raw_data", flat=True).first()
+    if row is not None or job.staging_format != job.FORMAT_COLUMNAR:
+        return row
+
+    chunk = (
+        job.chunks.filter(first_row__lte=row_number, last_row__gte=row_number)
+        .order_by("-first_row")
+        .first()
+    )
+    if chunk is None:
+        return None
+    return dict(decode_chunk(chunk)).get(row_number)
@@ -0,0 +1,111 @@
+"""
+Dry run of an import: what promoting the file would do, without writing.
+
+The file is streamed in batches of ``ALUMNI_IMPORT_BATCH_SIZE`` rows. For
+each batch the users, memberships (of the college) and enrollments of the
+emails not seen yet are loaded with ``IN`` queries, so only the people in
+the file are read, never the whole user table. Rows are then classified
+with the keys promotion uses: a membership is ``(user, role)`` and an
+enrollment ``(membership, course, enrollment number, start, end)``.
+"""
+from django.conf import settings
+
+from accounts.models import User
+from organization.imports.cleaning import RowError, clean_row
+from organization.imports.readers import iter_rows
+from organization.models import Enrollment, Membership
+
+
+def get_batch_size():
+    return getattr(settings, "ALUMNI_IMPORT_BATCH_SIZE", 1000)
+
+
+def _course(name, specialization):
+    # promotion leaves the course empty when the row has none
+    return (name, specialization) if name else None
+
+
+def _enrollment_key(data):
+    return (
+        data["email"],
+        data["role"],
+        _course(data["course"], data["specialization"]),
+        data["enrollment_number"],
+        data["start_year"],
+        data["end_year"],
+    )
+
+
+def _load(college, emails, users, memberships, enrollments):
+    """Add the existing records of ``emails`` to the known key sets."""
+    users.update(User.objects.filter(email__in=emails).values_list("email", flat=True))
+    members = {
+        pk: (email, role)
+        for pk, email, role in Membership.objects.filter(college=college, user__email__in=emails).values_list(
+            "pk", "user__email", "role"
+        )
+    }
+    memberships.update(members.values())
+    rows = Enrollment.objects.filter(membership_id__in=members).values_list(
+        "membership_id", "course__name", "course__specialization", "enrollment_number", "start_year", "end_year"
+    )
+    enrollments.update(
+        (*members[membership_id], _course(name, specialization), number, start, end)
+        for membership_id, name, specialization, number, start, end in rows
+    )
+
+
+def preview_import(job):
+    """
+    Return counts of the rows in ``job.file`` that would create or match
+    users, add memberships and enrollments, or fail validation. Rows repeated
+    in the file are only counted as new once.
+    """
+    college = job.college
+    counts = {
+        "rows": 0,
+        "invalid": 0,
+        "new_users": 0,
+        "existing_users": 0,
+        "new_memberships": 0,
+        "existing_memberships": 0,
+        "new_enrollments": 0,
+        "existing_enrollments": 0,
+        "errors": {},
+    }
+    # keys of the database and of the rows already classified, for the
+    # emails of the file only
+    loaded, users, memberships, enrollments = set(), set(), set(), set()
+
+    def count(name, key, known):
+        if key in known:
+            counts[f"existing_{name}"] += 1
+        else:
+            counts[f"new_{name}"] += 1
+            known.add(key)
+
+    def classify(batch):
+        emails = {data["email"] for data in batch} - loaded
+        if emails:
+            _load(college, emails, users, memberships, enrollments)
+            loaded.update(emails)
+        for data in batch:
+            count("users", data["email"], users)
+            count("memberships", (data["email"], data["role"]), memberships)
+            if data["start_year"] is not None:
+                count("enrollments", _enrollment_key(data), enrollments)
+
+    batch = []
+    for _, raw in iter_rows(job.file):
+        counts["rows"] += 1
+        try:
+            batch.append(clean_row(raw))
+        except RowError as exc:
+            counts["invalid"] += 1
+            counts["errors"][exc.field] = counts["errors"].get(exc.field, 0) + 1
+            continue
+        if len(batch) >= get_batch_size():
+            classify(batch)
+            batch = []
+    classify(batch)
+    return counts
@@ -0,0 +1,93 @@
+"""
+Streaming export of the failed rows of an import job.
+
+Rows are read with a chunked ``iterator()`` and encoded one at a time, so
+the report is never built in memory whatever the number of failures. The
+CSV header needs every column first, so CSV reports read the rows twice.
+"""
+import csv
+import json
+
+from django.conf import settings
+
+from organization.imports.archive import iter_archive
+from organization.models import ImportedAlumniRow
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+}
+
+
+class _Echo:
+    """File-like object that hands back what ``csv.writer`` writes."""
+
+    def write(self, value):
+        return value
+
+
+def _archived_failed_rows(job, error_type):
+    prefix = f"{error_type}:" if error_type else ""
+    for record in iter_archive(job):
+        if record["success"] is False and (record["message"] or "").startswith(prefix):
+            yield record["row_number"], record["raw_data"], record["message"]
+
+
+def failed_rows(job, error_type=None):
+    if job.archived_at:
+        return _archived_failed_rows(job, error_type)
+
+    rows = ImportedAlumniRow.objects.filter(import_job=job, processed=True, success=False)
+    if error_type:
+        rows = rows.filter(message__startswith=f"{error_type}:")
+    chunk_size = getattr(settings, "ALUMNI_IMPORT_EXPORT_CHUNK_SIZE", 2000)
+    return rows.order_by("pk").values_list("row_number", "raw_data", "message").iterator(chunk_size=chunk_size)
+
+
+def sheet_columns(rows):
+    """
+    Every column of ``rows`` in first-seen order. A short line of the sheet
+    is staged without its trailing columns, so no single row has them all.
+    """
+    columns = {}
+    for _, raw_data, _ in rows:
+        columns.update(dict.fromkeys(raw_data))
+    return list(columns)
+
+
+def iter_csv(rows, columns):
+    """
+    One line per failed row: ``row_number``, ``message`` and the original
+    columns, so the sheet can be fixed and uploaded again.
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(["row_number", "message", *columns])
+    for row_number, raw_data, message in rows:
+        yield writer.writerow([row_number, message, *(raw_data.get(column, "") for column in columns)])
+
+
+def iter_jsonl(rows):
+    for row_number, raw_data, message in rows:
+        yield json.dumps({"row_number": row_number, "message": message, "raw_data": raw_data}) + "\n"
+
+
+def _export_csv(job, error_type):
+    # a first pass over the failed rows finds the header, both stream
+    columns = sheet_columns(failed_rows(job, error_type))
+    if columns:
+        yield from iter_csv(failed_rows(job, error_type), columns)
+
+
+def _export_jsonl(job, error_type):
+    yield from iter_jsonl(failed_rows(job, error_type))
+
+
+ENCODERS = {
+    "csv": _export_csv,
+    "jsonl": _export_jsonl,
+}
+
+
+def export_errors(job, fmt, error_type=None):
+    """Return a generator of encoded lines for the failed rows of ``job``."""
+    return ENCODERS[fmt](job, error_type)
@@ -0,0 +1,198 @@
+"""
+Identity resolution across imports: find accounts of a college that likely
+belong to the same person (a second email, a typo in the name).
+
+Records are only compared inside blocks that share a key (phone, enrollment
+number, normalized name with dob, ...), so the work grows with the size of
+the blocks instead of with n². Pairs that score above the threshold are
+clustered with union-find and stored as ``DuplicateCandidate`` for admins.
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.conf import settings
+
+from organization.models import DuplicateCandidate, Enrollment, Membership
+
+WEIGHTS = {
+    "name": 0.5,
+    "phone": 0.25,
+    "enrollment_number": 0.25,
+    "dob": 0.15,
+}
+# a different date of birth is strong evidence of two people
+DOB_MISMATCH = -0.3
+
+
+def get_threshold():
+    return getattr(settings, "ALUMNI_DUPLICATE_THRESHOLD", 0.6)
+
+
+def get_max_block():
+    return getattr(settings, "ALUMNI_DUPLICATE_MAX_BLOCK", 50)
+
+
+def normalize_name(*parts):
+    """``"  José  D'Souza"`` -> ``"jose dsouza"``"""
+    text = unicodedata.normalize("NFKD", " ".join(p or "" for p in parts))
+    text = text.encode("ascii", "ignore").decode().lower()
+    return " ".join(re.sub(r"[^a-z\s]", "", text).split())
+
+
+def load_records(college):
+    """``{user_id: record}`` for every member of ``college``."""
+    records = {}
+    members = (
+        Membership.objects.filter(college=college)
+        .values_list(
+            "user_id",
+            "user__email",
+            "user__user_detail__first_name",
+            "user__user_detail__last_name",
+            "user__user_detail__phone",
+            "user__user_detail__dob",
+            "contact_phone",
+        )
+        .iterator(chunk_size=5000)
+    )
+    for user_id, email, first_name, last_name, phone, dob, contact_phone in members:
+        if user_id in records:
+            if contact_phone:
+                records[user_id]["phones"].add(contact_phone)
+            continue
+        name = normalize_name(first_name, last_name)
+        if not name:
+            # imported accounts without a profile only have their email
+            name = normalize_name(email.split("@")[0].replace(".", " "))
+        records[user_id] = {
+            "email": email,
+            "name": name,
+            # phones are unique per profile, so a second account made from
+            # the same phone only has it on the membership
+            "phones": {p for p in (phone, contact_phone) if p},
+            "dob": dob,
+            "enrollment_numbers": set(),
+        }
+
+    enrollments = (
+        Enrollment.objects.filter(membership__college=college, enrollment_number__isnull=False)
+        .values_list("membership__user_id", "enrollment_number")
+        .iterator(chunk_size=5000)
+    )
+    for user_id, number in enrollments:
+        if number:
+            records[user_id]["enrollment_numbers"].add(number.strip().upper())
+    return records
+
+
+def blocking_keys(record):
+    name = record["name"]
+    tokens = name.split()
+    for phone in record["phones"]:
+        yield ("phone", phone)
+    for number in record["enrollment_numbers"]:
+        yield ("enrollment_number", number)
+    if record["dob"] and tokens:
+        yield ("name_dob", name, record["dob"])
+        # catches a typo anywhere after the initials
+        yield ("initials_dob", tokens[0][0] + tokens[-1][0], record["dob"])
+    if name:
+        yield ("name", " ".join(sorted(tokens)))
+
+
+def build_blocks(records):
+    """Group record ids by blocking key, dropping keys too common to be useful."""
+    blocks = defaultdict(list)
+    for user_id, record in records.items():
+        for key in blocking_keys(record):
+            blocks[key].append(user_id)
+    max_block = get_max_block()
+    return [ids for ids in blocks.values() if 1 < len(ids) <= max_block]
+
+
+def score(a, b):
+    """Similarity of two records in [0, 1] and the fields that matched."""
+    reasons = []
+    total = 0.0
+
+    similarity = SequenceMatcher(None, a["name"], b["name"]).ratio() if a["name"] and b["name"] else 0.0
+    total += WEIGHTS["name"] * similarity
+    if similarity >= 0.85:
+        reasons.append("name")
+    if a["phones"] & b["phones"]:
+        total += WEIGHTS["phone"]
+        reasons.append("phone")
+    if a["enrollment_numbers"] & b["enrollment_numbers"]:
+        total += WEIGHTS["enrollment_number"]
+        reasons.append("enrollment_number")
+    if a["dob"] and b["dob"]:
+        if a["dob"] == b["dob"]:
+            total += WEIGHTS["dob"]
+            reasons.append("dob")
+        else:
+            total += DOB_MISMATCH
+    return max(0.0, min(1.0, total)), reasons
+
+
+class UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = x
+        while self.parent.setdefault(root, root) != root:
+            root = self.parent[root]
+        # path compression, iterative so long chains cannot hit the recursion limit
+        while x != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # the smallest id stays the root, it names the group
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_duplicates(records, threshold=None):
+    """Return ``[(user_id, other_id, group, score, reasons), ...]``."""
+    threshold = get_threshold() if threshold is None else threshold
+    seen = set()
+    matches = []
+    groups = UnionFind()
+    for ids in build_blocks(records):
+        for a, b in combinations(sorted(ids), 2):
+            if (a, b) in seen:
+                continue
+            seen.add((a, b))
+            value, reasons = score(records[a], records[b])
+            if value >= threshold:
+                matches.append((a, b, value, reasons))
+                groups.union(a, b)
+    return [(a, b, groups.find(a), value, reasons) for a, b, value, reasons in matches]
+
+
+def resolve_college(college, threshold=None):
+    """
+    Store the duplicate pairs of ``college`` as ``DuplicateCandidate`` and
+    return how many were found. Re-running refreshes scores and groups but
+    keeps the review status of pairs already seen.
+    """
+    matches = find_duplicates(load_records(college), threshold)
+    batch_size = getattr(settings, "ALUMNI_IMPORT_BATCH_SIZE", 1000)
+    for start in range(0, len(matches), batch_size):
+        DuplicateCandidate.objects.bulk_create(
+            [
+                DuplicateCandidate(
+                    college=college, user_id=a, other_id=b, group=group, score=round(value, 3), reasons=reasons
+                )
+                for a, b, group, value, reasons in matches[start:start + batch_size]
+            ],
+            update_conflicts=True,
+            unique_fields=["college", "user", "other"],
+            update_fields=["group", "score", "reasons", "updated_at"],
+        )
+    return len(matches)
@@ -0,0 +1,203 @@
+"""
+Progress of a running import job.
+
+Row outcomes and ``processed_rows`` are written once per batch, and after
+every batch a small snapshot of the job is published to the cache so the
+progress endpoint never has to touch ``imported_alumni_rows``.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from organization.imports.cleaning import error_type
+from organization.models import AlumniImport, ImportedAlumniRow, ImportedRowChunk
+
+
+def snapshot_key(job_id):
+    return f"organization:alumni_import:{job_id}:progress"
+
+
+def get_snapshot_ttl():
+    return getattr(settings, "ALUMNI_IMPORT_PROGRESS_TTL", 60 * 60)
+
+
+# seconds a snapshot read from the database is kept while the job runs: the
+# worker may publish to a cache this process cannot see (LocMem), so the
+# database has to be read again on the next poll
+ACTIVE_FALLBACK_TTL = 1
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def lease_expiry():
+    return timezone.now() + timedelta(seconds=getattr(settings, "ALUMNI_IMPORT_LEASE", 5 * 60))
+
+
+def error_count(errors):
+    return sum(((errors or {}).get("rows") or {}).values())
+
+
+def build_snapshot(job, rows_per_second=None):
+    """Snapshot of ``job`` built from the AlumniImport row alone."""
+    if rows_per_second is None:
+        rows_per_second = 0.0
+        if job.started_at:
+            elapsed = ((job.finished_at or timezone.now()) - job.started_at).total_seconds()
+            if elapsed > 0:
+                rows_per_second = job.processed_rows / elapsed
+
+    return {
+        "id": job.pk,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "error_count": error_count(job.errors),
+        "rows_per_second": round(rows_per_second, 1),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        # used to authorize readers, not part of the response
+        "college_admin": job.college.admin_id,
+    }
+
+
+def get_snapshot(job_id):
+    """Cached progress snapshot, falling back to a single primary key lookup."""
+    snapshot = cache.get(snapshot_key(job_id))
+    if snapshot is not None:
+        return snapshot
+
+    try:
+        job = AlumniImport.objects.select_related("college").get(pk=job_id)
+    except AlumniImport.DoesNotExist:
+        return None
+    snapshot = build_snapshot(job)
+    active = job.status in (AlumniImport.STATUS_PENDING, AlumniImport.STATUS_PROCESSING)
+    cache.set(snapshot_key(job_id), snapshot, ACTIVE_FALLBACK_TTL if active else get_snapshot_ttl())
+    return snapshot
+
+
+class ImportProgress:
+    """
+    Tracks one run of an import job: error counts, throughput and status.
+
+    The rate is measured over this run only, so a resumed job does not
+    report the rows processed before the crash as if they were just done.
+    """
+
+    def __init__(self, job, claim=None):
+        self.job = job
+        self.claim = claim
+        self.errors = job.errors or {}
+        self.errors.pop("job", None)
+        self._started = time.monotonic()
+        self._base_rows = job.processed_rows
+
+    def start(self):
+        self.job.status = AlumniImport.STATUS_PROCESSING
+        self.job.started_at = timezone.now()
+        self.job.finished_at = None
+        AlumniImport.objects.filter(pk=self.job.pk).update(
+            status=self.job.status, started_at=self.job.started_at, finished_at=None
+        )
+        self.publish()
+
+    def _held(self):
+        """The job, as long as this run still holds it."""
+        jobs = AlumniImport.objects.filter(pk=self.job.pk)
+        return jobs.filter(claim=self.claim) if self.claim else jobs
+
+    def renew(self):
+        """
+        Extend the lease of this run on the job. Raises ``LeaseLost`` when
+        another worker took the job over, which rolls back the batch the
+        renewal is part of.
+        """
+        if self.claim is None:
+            return
+        if not self._held().update(lease_expires_at=lease_expiry()):
+            raise LeaseLost(f"Import {self.job.pk} was taken over by another worker")
+
+    def finish(self, status, message=None):
+        if message:
+            self.errors["job"] = message
+        self.job.status = status
+        self.job.errors = self.errors
+        self.job.finished_at = timezone.now()
+        self._held().update(
+            status=status, errors=self.errors, finished_at=self.job.finished_at, claim=None, lease_expires_at=None
+        )
+        self.publish()
+
+    def rows_per_second(self):
+        elapsed = time.monotonic() - self._started
+        return (self.job.processed_rows - self._base_rows) / elapsed if elapsed > 0 else 0.0
+
+    def publish(self):
+        self.job.errors = self.errors
+        snapshot = build_snapshot(self.job, self.rows_per_second())
+        cache.set(snapshot_key(self.job.pk), snapshot, get_snapshot_ttl())
+
+    def _count_errors(self, rows):
+        row_errors = self.errors.setdefault("rows", {})
+        for row in rows:
+            key = error_type(row.message)
+            row_errors[key] = row_errors.get(key, 0) + 1
+
+    def record(self, rows):
+        """
+        Save ``processed``/``success``/``message`` for a batch of rows and
+        bump ``processed_rows`` by the rows that reached a final state, in one
+        transaction. Rows are grouped by outcome and each group is written
+        with a single UPDATE; failures share a handful of distinct messages,
+        so this is far cheaper than a ``bulk_update`` CASE per row.
+        """
+        failed = [row for row in rows if row.success is False]
+        promoted = [row.pk for row in rows if row.success and row.processed]
+        validated = [row.pk for row in rows if row.success and not row.processed]
+        by_message = {}
+        for row in failed:
+            by_message.setdefault(row.message, []).append(row.pk)
+
+        with transaction.atomic():
+            self.renew()
+            if promoted:
+                ImportedAlumniRow.objects.filter(pk__in=promoted).update(processed=True, success=True, message=None)
+            if validated:
+                ImportedAlumniRow.objects.filter(pk__in=validated).update(success=True, message=None)
+            for message, pks in by_message.items():
+                ImportedAlumniRow.objects.filter(pk__in=pks).update(processed=True, success=False, message=message)
+
+            done = len(promoted) + len(failed)
+            self._advance(done, failed)
+        return done
+
+    def record_chunk(self, chunk, rows):
+        """
+        Columnar counterpart of ``record``: the chunk is marked processed and
+        only its failed rows are written out as ImportedAlumniRow, so they
+        can be exported and retried like any other staged row.
+        """
+        failed = [row for row in rows if row.success is False]
+        with transaction.atomic():
+            self.renew()
+            ImportedAlumniRow.objects.bulk_create(failed)
+            ImportedRowChunk.objects.filter(pk=chunk.pk).update(processed=True)
+            self._advance(len(rows), failed)
+        return len(rows)
+
+    def _advance(self, done, failed):
+        if not done:
+            return
+        self._count_errors(failed)
+        AlumniImport.objects.filter(pk=self.job.pk).update(
+            processed_rows=F("processed_rows") + done, errors=self.errors
+        )
+        self.job.processed_rows += done
+        transaction.on_commit(self.publish)
@@ -0,0 +1,242 @@
+"""
+Promote staged alumni rows into ``User``, ``Membership`` and ``Enrollment``.
+
+Promotion is set based: a batch is resolved with one ``IN`` query per table
+and the missing records are inserted with one ``executemany`` of plain
+tuples, so the number of queries per batch is constant no matter how many
+rows it holds. ``bulk_create`` would build a model instance per row and
+prepare every field of it, which costs far more than the insert itself;
+here the columns the import does not set get their default once per batch.
+"""
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connection, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from accounts.models import User, UserDetail
+from organization.imports.cleaning import RowError, clean_row, normalize_row
+from organization.models import Course, Enrollment, Membership
+
+
+def _insert(model, columns, rows, ignore_conflicts=False):
+    """
+    Insert ``rows``, tuples of database ready values for the fields named in
+    ``columns``. Every other field but the primary key is set to its default,
+    or to the current time for ``auto_now`` fields. Like ``bulk_create``, this
+    sends no signals and does not call ``save()``.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    now = timezone.now()
+    fields = [model._meta.get_field(name) for name in columns]
+    defaults = []
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.name in columns:
+            continue
+        stamped = getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+        value = now if stamped else field.get_default()
+        fields.append(field)
+        defaults.append(field.get_db_prep_save(value, connection))
+    if defaults:
+        rows = [(*row, *defaults) for row in rows]
+
+    on_conflict = OnConflict.IGNORE if ignore_conflicts else None
+    ops = connection.ops
+    sql = "{} {} ({}) VALUES ({}) {}".format(
+        ops.insert_statement(on_conflict=on_conflict),
+        ops.quote_name(model._meta.db_table),
+        ", ".join(ops.quote_name(field.column) for field in fields),
+        ", ".join(["%s"] * len(fields)),
+        ops.on_conflict_suffix_sql(fields, on_conflict, None, None),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def _resolve_users(records):
+    """Return ``{email: user_id}`` for every record, creating missing users."""
+    emails = {data["email"] for _, data in records}
+    users = dict(User.objects.filter(email__in=emails).values_list("email", "pk"))
+
+    new = {}
+    for _, data in records:
+        if data["email"] not in users:
+            new.setdefault(data["email"], data)
+    if not new:
+        return users
+
+    # profile details need a phone (unique) and a first name; a phone shared
+    # by several new emails goes to the first of them only
+    phones = {}
+    for email, data in new.items():
+        if data["phone"] and data["first_name"]:
+            phones.setdefault(data["phone"], email)
+    taken = set(UserDetail.objects.filter(phone__in=phones).values_list("phone", flat=True))
+    details = [phone for phone in phones if phone not in taken]
+    _insert(
+        UserDetail,
+        ("phone", "first_name", "last_name"),
+        ((phone, new[phones[phone]]["first_name"], new[phones[phone]]["last_name"]) for phone in details),
+    )
+    detail_ids = dict(UserDetail.objects.filter(phone__in=details).values_list("phone", "pk")) if details else {}
+
+    # imported accounts cannot log in until they are claimed; one unusable
+    # password per batch saves generating a random string for every user
+    password = make_password(None)
+    _insert(
+        User,
+        ("email", "password", "user_detail"),
+        (
+            (email, password, detail_ids.get(data["phone"]) if phones.get(data["phone"]) == email else None)
+            for email, data in new.items()
+        ),
+        ignore_conflicts=True,
+    )
+
+    users.update(User.objects.filter(email__in=new).values_list("email", "pk"))
+    return users
+
+
+def _resolve_memberships(college, records, users):
+    """Return ``{(user_id, role): membership_id}``, creating missing memberships."""
+    keys = {(users[data["email"]], data["role"]): data for _, data in records}
+    existing = Membership.objects.filter(
+        college=college, user_id__in={user_id for user_id, _ in keys}
+    ).values_list("user_id", "role", "pk")
+    memberships = {(user_id, role): pk for user_id, role, pk in existing}
+
+    missing = [
+        (user_id, college.pk, role, data["email"], data["phone"] or None)
+        for (user_id, role), data in keys.items()
+        if (user_id, role) not in memberships
+    ]
+    if missing:
+        _insert(
+            Membership, ("user", "college", "role", "contact_email", "contact_phone"), missing, ignore_conflicts=True
+        )
+        created = Membership.objects.filter(
+            college=college, user_id__in={row[0] for row in missing}
+        ).values_list("user_id", "role", "pk")
+        memberships.update({(user_id, role): pk for user_id, role, pk in created})
+    return memberships
+
+
+def _resolve_courses(college, records):
+    """Return ``{(name, specialization): course_id}`` for the courses in the batch."""
+    durations = {}
+    for _, data in records:
+        if data["course"] and data["start_year"] is not None:
+            key = (data["course"], data["specialization"])
+            durations.setdefault(key, max(data["end_year"] - data["start_year"], 1))
+    if not durations:
+        return {}
+
+    def lookup():
+        rows = Course.objects.filter(
+            college=college, name__in={name for name, _ in durations}
+        ).values_list("name", "specialization", "pk")
+        return {(name, spec): pk for name, spec, pk in rows}
+
+    courses = lookup()
+    missing = [
+        Course(college=college, name=name, specialization=spec, duration_years=years)
+        for (name, spec), years in durations.items()
+        if (name, spec) not in courses
+    ]
+    if missing:
+        Course.objects.bulk_create(missing, ignore_conflicts=True)
+        courses = lookup()
+    return courses
+
+
+def _attach_enrollments(college, records, users, memberships):
+    courses = _resolve_courses(college, records)
+    wanted = {}
+    for _, data in records:
+        if data["start_year"] is None:
+            continue
+        membership_id = memberships[(users[data["email"]], data["role"])]
+        course_id = courses.get((data["course"], data["specialization"]))
+        key = (membership_id, course_id, data["enrollment_number"], data["start_year"], data["end_year"])
+        wanted[key] = None
+    if not wanted:
+        return
+
+    existing = set(
+        Enrollment.objects.filter(membership_id__in={key[0] for key in wanted}).values_list(
+            "membership_id", "course_id", "enrollment_number", "start_year", "end_year"
+        )
+    )
+    _insert(
+        Enrollment,
+        ("membership", "course", "enrollment_number", "start_year", "end_year"),
+        (key for key in wanted if key not in existing),
+    )
+
+
+def promote_records(college, records):
+    """
+    Promote ``(row, data)`` pairs whose data has already been cleaned and
+    return the ``(row, RowError)`` pairs that could not be promoted.
+    Must be called inside a transaction.
+    """
+    if not records:
+        return []
+    users = _resolve_users(records)
+    failed = [
+        (row, RowError("database", f"user {data['email']} could not be created"))
+        for row, data in records
+        if data["email"] not in users
+    ]
+    if failed:
+        records = [(row, data) for row, data in records if data["email"] in users]
+    memberships = _resolve_memberships(college, records, users)
+    _attach_enrollments(college, records, users, memberships)
+    return failed
+
+
+def _promote_each(college, records):
+    """Row by row fallback for a batch that hit an integrity error."""
+    failed = []
+    for row, data in records:
+        try:
+            with transaction.atomic():
+                failed.extend(promote_records(college, [(row, data)]))
+        except IntegrityError as exc:
+            failed.append((row, RowError("database", str(exc))))
+    return failed
+
+
+def promote_rows(job, rows):
+    """
+    Promote a batch of staged rows, setting ``processed``, ``success`` and
+    ``message`` on each row. The caller is responsible for saving the rows
+    and for the surrounding transaction.
+    """
+    records = []
+    for row in rows:
+        if row.processed and row.success is False:
+            # rejected by the validation stage
+            continue
+        row.processed = True
+        if row.success:
+            # already passed the validation stage
+            records.append((row, normalize_row(row.raw_data)))
+            continue
+        try:
+            records.append((row, clean_row(row.raw_data)))
+        except RowError as exc:
+            row.success, row.message = False, str(exc)
+
+    try:
+        with transaction.atomic():
+            failed = promote_records(job.college, records)
+    except IntegrityError:
+        failed = _promote_each(job.college, records)
+
+    for row, _ in records:
+        row.success, row.message = True, None
+    for row, exc in failed:
+        row.success, row.message = False, str(exc)
+    return rows
@@ -0,0 +1,95 @@
+"""
+Row readers for uploaded alumni sheets.
+
+Every reader is a generator that yields ``(row_number, data)`` pairs where
+``data`` maps the normalized header names to the cell values of one row.
+Files are read lazily, so a 1M row sheet is never held in memory.
+"""
+import csv
+import datetime as dt
+import io
+import os
+import re
+
+
+class UnsupportedFileError(Exception):
+    pass
+
+
+def normalize_header(name):
+    """'Enrollment Number ' -> 'enrollment_number'"""
+    name = str(name or "").strip().lower()
+    return re.sub(r"[^a-z0-9]+", "_", name).strip("_")
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, dt.datetime):
+        value = value.date() if value.time() == dt.time.min else value
+    if isinstance(value, (dt.date, dt.datetime)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        # Excel stores phone numbers and years as floats
+        return str(int(value))
+    return str(value).strip()
+
+
+def _rows(header, records):
+    header = [normalize_header(h) for h in header]
+    row_number = 0
+    for record in records:
+        row_number += 1
+        values = [_cell(value) for value in record]
+        if not any(values):
+            continue
+        yield row_number, {key: value for key, value in zip(header, values) if key}
+
+
+def iter_csv_rows(fileobj, encoding="utf-8-sig"):
+    text = io.TextIOWrapper(fileobj, encoding=encoding, newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield from _rows(header, reader)
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise UnsupportedFileError("Excel imports require the 'openpyxl' package")
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        records = workbook.active.iter_rows(values_only=True)
+        header = next(records, None)
+        if header is None:
+            return
+        yield from _rows(header, records)
+    finally:
+        workbook.close()
+
+
+READERS = {
+    ".csv": iter_csv_rows,
+    ".xlsx": iter_xlsx_rows,
+}
+
+
+def iter_rows(field_file):
+    """Stream ``(row_number, data)`` pairs out of an ``AlumniImport.file``."""
+    ext = os.path.splitext(field_file.name)[1].lower()
+    reader = READERS.get(ext)
+    if reader is None:
+        raise UnsupportedFileError(f"Unsupported file type '{ext}', upload a .csv or .xlsx file")
+
+    field_file.open("rb")
+    try:
+        yield from reader(field_file.file)
+    finally:
+        field_file.close()
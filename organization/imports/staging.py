@@ -0,0 +1,93 @@
+"""
+Stage an uploaded alumni sheet into ``ImportedAlumniRow`` or, for columnar
+jobs, ``ImportedRowChunk``.
+
+The file is streamed row by row and written with ``bulk_create`` in chunks,
+one short transaction per chunk, so the SQLite writer lock is only held for
+the duration of a single insert batch.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Sum
+
+from organization.imports.columnar import build_chunk
+from organization.imports.readers import iter_rows
+from organization.models import AlumniImport, ImportedAlumniRow
+
+
+def get_chunk_size(chunk_size=None):
+    return chunk_size or getattr(settings, "ALUMNI_IMPORT_CHUNK_SIZE", 2000)
+
+
+def get_columnar_chunk_rows():
+    return getattr(settings, "ALUMNI_IMPORT_COLUMNAR_CHUNK_ROWS", 5000)
+
+
+def _flush(job, objs, total_rows):
+    with transaction.atomic():
+        type(objs[0]).objects.bulk_create(objs)
+        AlumniImport.objects.filter(pk=job.pk).update(total_rows=total_rows)
+    job.total_rows = total_rows
+
+
+def _stage_rows(job, rows, chunk_size):
+    last_staged = job.rows.aggregate(last=Max("row_number"))["last"] or 0
+    total_rows = job.rows.count() if last_staged else 0
+
+    buffer = []
+    for row_number, data in rows:
+        if row_number <= last_staged:
+            continue
+        buffer.append(ImportedAlumniRow(import_job=job, row_number=row_number, raw_data=data))
+        if len(buffer) >= chunk_size:
+            total_rows += len(buffer)
+            _flush(job, buffer, total_rows)
+            buffer = []
+
+    if buffer:
+        total_rows += len(buffer)
+        _flush(job, buffer, total_rows)
+    return total_rows
+
+
+def _stage_chunks(job, rows, chunk_size):
+    staged = job.chunks.aggregate(last=Max("last_row"), total=Sum("row_count"))
+    last_staged = staged["last"] or 0
+    total_rows = staged["total"] or 0
+    chunk_rows = get_columnar_chunk_rows()
+
+    chunks, buffer = [], []
+    for row_number, data in rows:
+        if row_number <= last_staged:
+            continue
+        buffer.append((row_number, data))
+        if len(buffer) >= chunk_rows:
+            chunks.append(build_chunk(job, buffer))
+            total_rows += len(buffer)
+            buffer = []
+            # chunks are large, so a handful make a full insert batch
+            if len(chunks) * chunk_rows >= chunk_size:
+                _flush(job, chunks, total_rows)
+                chunks = []
+
+    if buffer:
+        chunks.append(build_chunk(job, buffer))
+        total_rows += len(buffer)
+    if chunks:
+        _flush(job, chunks, total_rows)
+    return total_rows
+
+
+def stage_import(job, chunk_size=None):
+    """
+    Read ``job.file`` into staged rows and return the number of rows staged.
+
+    Staging is resumable: rows already staged for the job (up to the highest
+    ``row_number``) are skipped, so a crash half way through only re-reads the
+    file, it does not insert duplicates.
+    """
+    chunk_size = get_chunk_size(chunk_size)
+    rows = iter_rows(job.file)
+    if job.staging_format == AlumniImport.FORMAT_COLUMNAR:
+        return _stage_chunks(job, rows, chunk_size)
+    return _stage_rows(job, rows, chunk_size)
@@ -0,0 +1,120 @@
+"""
+Synthetic alumni sheets for benchmarking imports.
+
+Rows look like a real college export: most are new people, some repeat an
+earlier row exactly, some add another enrollment for a person already in
+the sheet, some are a new person sharing the phone of an earlier one (a
+family number, or someone who changed email), and a few carry an invalid
+email or phone. Every role is a valid membership role, so only the invalid
+rate fails validation. Generation is seeded and streaming, so a 1M row
+sheet is reproducible and never held in memory.
+"""
+import csv
+import random
+
+FIELDS = [
+    "email",
+    "first_name",
+    "last_name",
+    "phone",
+    "role",
+    "course",
+    "specialization",
+    "enrollment_number",
+    "start_year",
+    "end_year",
+]
+
+FIRST_NAMES = [
+    "aarav", "aditi", "akash", "ananya", "arjun", "diya", "ishaan", "kavya", "meera", "nikhil",
+    "priya", "rahul", "riya", "rohan", "sanya", "shreya", "tanvi", "varun", "vivek", "zara",
+]
+LAST_NAMES = [
+    "agarwal", "bose", "chopra", "desai", "gupta", "iyer", "joshi", "kapoor", "kumar", "mehta",
+    "nair", "patel", "rao", "reddy", "shah", "sharma", "singh", "verma", "yadav", "das",
+]
+COURSES = {
+    "BTech": ["Computer Science", "Mechanical", "Electrical", "Civil"],
+    "MTech": ["Data Science", "VLSI", None],
+    "MBA": ["Finance", "Marketing", None],
+    "BSc": ["Physics", "Mathematics", None],
+}
+DURATION = {"BTech": 4, "MTech": 2, "MBA": 2, "BSc": 3}
+ROLES = ["alumni"] * 18 + ["student", "faculty"]
+
+DOMAIN = "alumni.example.org"
+
+# people kept around to draw duplicates and extra enrollments from
+RECENT = 2000
+
+
+def _invalid_email(rng, row):
+    local = row["email"].split("@")[0]
+    return rng.choice([f"{local}@@{DOMAIN}", f"{local}..x@{DOMAIN}", local, f"@{DOMAIN}"])
+
+
+def _invalid_phone(rng, row):
+    return rng.choice([row["phone"][:7], row["phone"][:5] + "abcde", "+91" + row["phone"]])
+
+
+def _enrollment(rng, row, serial):
+    course = rng.choice(list(COURSES))
+    start = rng.randint(1995, 2022)
+    return dict(
+        row,
+        course=course,
+        specialization=rng.choice(COURSES[course]) or "",
+        enrollment_number=f"EN{serial:08d}",
+        start_year=str(start),
+        end_year=str(start + DURATION[course]),
+    )
+
+
+def generate_rows(
+    count, seed=0, duplicate_rate=0.02, multi_enrollment_rate=0.08, shared_phone_rate=0.01, invalid_rate=0.03
+):
+    """Yield ``count`` raw rows (dicts keyed by ``FIELDS``)."""
+    rng = random.Random(seed)
+    recent = []
+    person = 0
+    for serial in range(1, count + 1):
+        draw = rng.random()
+        if recent and draw < duplicate_rate:
+            row = rng.choice(recent)
+        elif recent and draw < duplicate_rate + multi_enrollment_rate:
+            row = _enrollment(rng, rng.choice(recent), serial)
+        else:
+            person += 1
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            shared = recent and draw < duplicate_rate + multi_enrollment_rate + shared_phone_rate
+            row = _enrollment(
+                rng,
+                {
+                    "email": f"{first}.{last}{person}@{DOMAIN}",
+                    "first_name": first.title(),
+                    "last_name": last.title(),
+                    "phone": rng.choice(recent)["phone"] if shared else f"9{person:09d}",
+                    "role": rng.choice(ROLES),
+                },
+                serial,
+            )
+            recent.append(row)
+            if len(recent) > RECENT:
+                recent.pop(rng.randrange(len(recent)))
+
+        if rng.random() < invalid_rate:
+            if rng.random() < 0.5:
+                row = dict(row, email=_invalid_email(rng, row))
+            else:
+                row = dict(row, phone=_invalid_phone(rng, row))
+        yield row
+
+
+def write_sheet(path, count, seed=0, **rates):
+    """Write a synthetic CSV sheet of ``count`` rows to ``path``."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in generate_rows(count, seed=seed, **rates):
+            writer.writerow(row)
+    return path
@@ -0,0 +1,103 @@
+"""
+Validation stage for staged alumni rows.
+
+Rows are validated with ``accounts.validators`` in a process pool: each
+window of unvalidated rows is split into one slice per worker, only the raw
+dicts cross the process boundary, and the outcome is written back in bulk.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import django
+from django.apps import apps
+from django.conf import settings
+
+from organization.imports.cleaning import RowError, clean_row
+
+# below this many rows a window is validated in-process, pickling would cost more
+MIN_PARALLEL_ROWS = 2000
+
+
+def _init_worker():
+    # spawned (non-forked) workers start without a configured Django
+    if not apps.ready:
+        django.setup()
+
+
+def _validate_slice(raws):
+    messages = []
+    for raw in raws:
+        try:
+            clean_row(raw)
+        except RowError as exc:
+            messages.append(str(exc))
+        else:
+            messages.append(None)
+    return messages
+
+
+def get_workers(workers=None):
+    return workers or getattr(settings, "ALUMNI_IMPORT_VALIDATION_WORKERS", None) or os.cpu_count() or 1
+
+
+@contextmanager
+def validation_pool(workers):
+    """Process pool shared by every window of a run, None when single process."""
+    if workers <= 1:
+        yield None
+        return
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker)
+    try:
+        yield executor
+    finally:
+        executor.shutdown()
+
+
+def validate_rows(rows, executor=None, workers=1):
+    """
+    Validate staged rows in memory. Valid rows get ``success=True``, invalid
+    rows are marked processed with ``success=False`` and the error message.
+    """
+    raws = [row.raw_data for row in rows]
+    if executor is None or workers <= 1 or len(raws) < MIN_PARALLEL_ROWS:
+        messages = _validate_slice(raws)
+    else:
+        size = -(-len(raws) // workers)
+        slices = [raws[i:i + size] for i in range(0, len(raws), size)]
+        messages = [message for part in executor.map(_validate_slice, slices) for message in part]
+
+    for row, message in zip(rows, messages):
+        if message is None:
+            row.success, row.message = True, None
+        else:
+            row.processed, row.success, row.message = True, False, message
+    return rows
+
+
+def validate_import(progress, workers=None, window=None):
+    """
+    Validate every staged row of ``job`` that has not been validated yet and
+    return the number of invalid rows. Safe to re-run after a crash: rows
+    already validated keep their outcome.
+    """
+    job = progress.job
+    workers = get_workers(workers)
+    window = window or getattr(settings, "ALUMNI_IMPORT_VALIDATION_WINDOW", 20000)
+    pending = (
+        job.rows.filter(processed=False, success__isnull=True)
+        .only("import_job", "raw_data", "processed", "success", "message")
+        .order_by("pk")
+    )
+
+    invalid = 0
+    with validation_pool(workers) as executor:
+        last_pk = 0
+        while True:
+            rows = list(pending.filter(pk__gt=last_pk)[:window])
+            if not rows:
+                break
+            validate_rows(rows, executor, workers)
+            invalid += progress.record(rows)
+            last_pk = rows[-1].pk
+    return invalid
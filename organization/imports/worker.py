@@ -0,0 +1,123 @@
+"""
+Import worker: stage -> validate -> promote, resumable after a crash.
+
+Rows are promoted in bounded batches, each in its own transaction, so other
+writers get the database between batches. Progress lives on the staged
+records themselves (``processed`` on rows, or on chunks for columnar jobs),
+and the next batch is always read from the ``(import_job, processed)``
+index, so a restarted worker carries on from the first unprocessed row
+instead of starting over.
+
+A run claims the job with a token and a lease that every batch renews in
+its own transaction. A second worker can only take over once the lease has
+run out, and the first one then fails its next renewal and rolls back that
+batch, so two workers never commit batches of the same job.
+"""
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from organization.imports.columnar import chunk_rows
+from organization.imports.progress import ImportProgress, LeaseLost, lease_expiry
+from organization.imports.promote import promote_rows
+from organization.imports.staging import stage_import
+from organization.imports.validation import get_workers, validate_import, validate_rows, validation_pool
+from organization.models import AlumniImport
+
+RESUMABLE = (AlumniImport.STATUS_PENDING, AlumniImport.STATUS_FAILED)
+
+
+class ImportNotRunnable(Exception):
+    pass
+
+
+def get_batch_size(batch_size=None):
+    return batch_size or getattr(settings, "ALUMNI_IMPORT_BATCH_SIZE", 1000)
+
+
+def promote_pending(progress, batch_size=None):
+    batch_size = get_batch_size(batch_size)
+    job = progress.job
+    last_pk = 0
+    while True:
+        # read in the transaction that records it, which also renews the lease
+        with transaction.atomic():
+            batch = list(job.rows.filter(processed=False, pk__gt=last_pk).order_by("pk")[:batch_size])
+            if not batch:
+                break
+            promote_rows(job, batch)
+            progress.record(batch)
+        last_pk = batch[-1].pk
+
+
+def process_chunks(progress, workers=None):
+    """
+    Columnar jobs validate and promote one chunk at a time; the chunk's
+    ``processed`` flag is the checkpoint, read from ``(import_job, processed)``.
+    """
+    job = progress.job
+    workers = get_workers(workers)
+    pending = job.chunks.filter(processed=False).order_by("first_row")
+    with validation_pool(workers) as executor:
+        last_row = 0
+        while True:
+            chunk = pending.filter(first_row__gt=last_row).first()
+            if chunk is None:
+                break
+            rows = validate_rows(chunk_rows(job, chunk), executor, workers)
+            with transaction.atomic():
+                promote_rows(job, rows)
+                progress.record_chunk(chunk, rows)
+            last_row = chunk.first_row
+
+
+def run_import(job, batch_size=None, workers=None):
+    """
+    Run (or resume) an import job to completion and return it.
+
+    Failed jobs, and processing jobs whose worker stopped renewing its lease
+    (``ALUMNI_IMPORT_LEASE``), can be run again; already processed rows are
+    never promoted twice. Archived jobs, and jobs whose archiving has written
+    the archive file but not finished deleting the staged rows, cannot be run.
+    """
+    batch_size = get_batch_size(batch_size)
+    claim = uuid.uuid4()
+    runnable = Q(status__in=RESUMABLE) | Q(status=AlumniImport.STATUS_PROCESSING) & (
+        Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=timezone.now())
+    )
+    unarchived = Q(archived_at__isnull=True) & (Q(archive__isnull=True) | Q(archive=""))
+    claimed = AlumniImport.objects.filter(runnable, unarchived, pk=job.pk).update(
+        status=AlumniImport.STATUS_PROCESSING, claim=claim, lease_expires_at=lease_expiry()
+    )
+    if not claimed:
+        job.refresh_from_db(fields=["status", "archive", "archived_at"])
+        if job.archived_at or job.archive:
+            raise ImportNotRunnable(f"Import {job.pk} is archived")
+        if job.status == AlumniImport.STATUS_PROCESSING:
+            raise ImportNotRunnable(f"Import {job.pk} is being processed by another worker")
+        raise ImportNotRunnable(f"Import {job.pk} is already {job.status}")
+    job.refresh_from_db()
+
+    progress = ImportProgress(job, claim)
+    progress.start()
+    try:
+        stage_import(job)
+        # staging is not checkpointed, make sure the job is still ours
+        progress.renew()
+        if job.staging_format == AlumniImport.FORMAT_COLUMNAR:
+            process_chunks(progress, workers)
+        else:
+            validate_import(progress, workers=workers)
+            promote_pending(progress, batch_size)
+    except LeaseLost as exc:
+        # the job and its status belong to the worker that took it over
+        raise ImportNotRunnable(str(exc))
+    except Exception as exc:
+        progress.finish(AlumniImport.STATUS_FAILED, str(exc))
+        raise
+
+    progress.finish(AlumniImport.STATUS_DONE)
+    return job
@@ -0,0 +1,149 @@
+"""
+Bulk member invitations.
+
+Recipients are handled in batches: invitations (and their tokens) are made
+with one ``bulk_create``, the personalized bodies are rendered in a process
+pool, and the messages go to the email outbox with bulk inserts. Delivery,
+pooled connections and the send rate are up to ``send_queued_emails``.
+"""
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from accounts.validators import validate_email
+from emails.outbox import enqueue_many
+from emails.rendering import render_many
+from emails.utils import INVITE_SUBJECT, INVITE_TEMPLATE, invite_context
+from organization.imports.archive import iter_archive, iter_records
+from organization.models import Invitation, Membership
+
+# below this many messages a batch is rendered in-process
+MIN_PARALLEL_RENDER = 200
+
+
+def _init_worker():
+    if not apps.ready:
+        django.setup()
+
+
+def _render_slice(contexts):
+    return render_many(INVITE_TEMPLATE, contexts)
+
+
+def get_workers(workers=None):
+    return workers or getattr(settings, "INVITATION_RENDER_WORKERS", None) or os.cpu_count() or 1
+
+
+@contextmanager
+def render_pool(workers):
+    if workers <= 1:
+        yield None
+        return
+    executor = ProcessPoolExecutor(workers, initializer=_init_worker)
+    try:
+        yield executor
+    finally:
+        executor.shutdown()
+
+
+def render_all(contexts, executor=None, workers=1):
+    """``[(text, html), ...]`` for ``contexts``, split across the pool."""
+    if executor is None or len(contexts) < MIN_PARALLEL_RENDER:
+        return _render_slice(contexts)
+    size = -(-len(contexts) // workers)
+    slices = [contexts[i:i + size] for i in range(0, len(contexts), size)]
+    return [body for part in executor.map(_render_slice, slices) for body in part]
+
+
+def recipients_from_import(job):
+    """``(email, name)`` of every row an import promoted successfully."""
+    records = iter_archive(job) if job.archived_at else iter_records(job)
+    for record in records:
+        if record["success"]:
+            data = record["raw_data"]
+            yield data.get("email") or "", data.get("first_name") or ""
+
+
+def build_invitations(college, recipients, role=Membership.ROLE_ALUMNI, import_job=None):
+    """
+    Unsaved invitations, with their tokens, for the new addresses among
+    ``recipients``. Invalid addresses, repeats and addresses already invited
+    to the college are skipped.
+    """
+    wanted = {}
+    for email, name in recipients:
+        email = (email or "").strip().lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            continue
+        wanted.setdefault(email, (name or "").strip())
+    if not wanted:
+        return []
+
+    # 500 per IN clause stays under SQLite's parameter limit
+    emails = list(wanted)
+    invited = set()
+    for i in range(0, len(emails), 500):
+        invited.update(
+            Invitation.objects.filter(college=college, email__in=emails[i:i + 500]).values_list("email", flat=True)
+        )
+
+    return [
+        Invitation(
+            college=college,
+            email=email,
+            name=name,
+            role=role,
+            token=secrets.token_urlsafe(32),
+            import_job=import_job,
+        )
+        for email, name in wanted.items()
+        if email not in invited
+    ]
+
+
+def _batches(recipients, size):
+    batch = []
+    for recipient in recipients:
+        batch.append(recipient)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def invite_members(college, recipients, role=Membership.ROLE_ALUMNI, import_job=None, workers=None):
+    """
+    Invite ``recipients`` (``(email, name)`` pairs) to ``college`` and queue
+    their invite emails. Returns the number of invitations made.
+    """
+    workers = get_workers(workers)
+    batch_size = getattr(settings, "INVITATION_BATCH_SIZE", 2000)
+    invited = 0
+    with render_pool(workers) as executor:
+        for batch in _batches(recipients, batch_size):
+            invitations = build_invitations(college, batch, role, import_job)
+            contexts = [
+                invite_context(invitation.name or invitation.email.split("@")[0], college.name, invitation.token)
+                for invitation in invitations
+            ]
+            # render before opening the transaction, the write lock is only
+            # held for the inserts
+            bodies = render_all(contexts, executor, workers)
+            with transaction.atomic():
+                Invitation.objects.bulk_create(invitations)
+                enqueue_many(
+                    {"subject": INVITE_SUBJECT, "body": text, "html": html, "to": [invitation.email]}
+                    for invitation, (text, html) in zip(invitations, bodies)
+                )
+            invited += len(invitations)
+    return invited
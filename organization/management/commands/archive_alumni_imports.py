@@ -0,0 +1,60 @@
+import datetime as dt
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from organization.imports.archive import ARCHIVABLE, ImportNotArchivable, archive_import, rehydrate_import
+from organization.models import AlumniImport
+
+
+class Command(BaseCommand):
+    help = "Archive the staged rows of finished alumni imports, or rehydrate an archived import"
+
+    def add_arguments(self, parser):
+        parser.add_argument("import_ids", nargs="*", type=int, help="Archive only these imports")
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=None,
+            help="Days since an import finished (default: ALUMNI_IMPORT_ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument("--rehydrate", type=int, metavar="IMPORT_ID", help="Restore an archived import's rows")
+
+    def handle(self, *args, **options):
+        if options["rehydrate"]:
+            return self.rehydrate(options["rehydrate"])
+
+        if options["import_ids"]:
+            jobs = AlumniImport.objects.filter(pk__in=options["import_ids"])
+        else:
+            days = options["older_than"]
+            if days is None:
+                days = getattr(settings, "ALUMNI_IMPORT_ARCHIVE_AFTER_DAYS", 30)
+            cutoff = timezone.now() - dt.timedelta(days=days)
+            jobs = AlumniImport.objects.filter(
+                Q(finished_at__lt=cutoff) | Q(finished_at__isnull=True, created_at__lt=cutoff),
+                status__in=ARCHIVABLE,
+                archived_at__isnull=True,
+            )
+
+        for job in jobs.order_by("created_at"):
+            try:
+                summary = archive_import(job)
+            except ImportNotArchivable as exc:
+                self.stderr.write(str(exc))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"Archived import {job.pk}: {summary['rows']} rows to {job.archive.name}"
+            ))
+
+    def rehydrate(self, import_id):
+        try:
+            job = AlumniImport.objects.get(pk=import_id)
+            restored = rehydrate_import(job)
+        except AlumniImport.DoesNotExist:
+            raise CommandError(f"Import {import_id} does not exist")
+        except ImportNotArchivable as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} rows for import {job.pk}"))
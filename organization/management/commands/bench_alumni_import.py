@@ -0,0 +1,152 @@
+import datetime as dt
+import os
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from accounts.models import User, UserDetail
+from organization.imports.progress import ImportProgress, error_count
+from organization.imports.readers import iter_rows
+from organization.imports.staging import stage_import
+from organization.imports.synthetic import DOMAIN, write_sheet
+from organization.imports.validation import validate_import
+from organization.imports.worker import process_chunks, promote_pending
+from organization.models import AlumniImport, College, Enrollment, Membership
+
+BENCH_ADMIN = f"bench.admin@{DOMAIN}"
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` that counts the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _delete_in_batches(queryset, batch_size=5000):
+    model = queryset.model
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        model.objects.filter(pk__in=pks).delete()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark alumni imports on synthetic sheets: time the parse, stage, validate and promote "
+        "stages and report rows/sec, peak RSS and query counts. Writes to the configured database, "
+        "so run it against a scratch copy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Sheet sizes to run"
+        )
+        parser.add_argument(
+            "--format",
+            choices=[AlumniImport.FORMAT_ROWS, AlumniImport.FORMAT_COLUMNAR],
+            default=AlumniImport.FORMAT_ROWS,
+            help="Staging format of the benchmark imports",
+        )
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows promoted per transaction")
+        parser.add_argument("--workers", type=int, default=None, help="Validation processes (default: CPU count)")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--keep", action="store_true", help="Keep the imported data instead of cleaning up")
+
+    def handle(self, *args, **options):
+        for count in options["rows"]:
+            college = self.setup()
+            try:
+                self.run(college, count, options)
+            finally:
+                if not options["keep"]:
+                    self.cleanup(college)
+
+    def setup(self):
+        admin, _ = User.objects.get_or_create(email=BENCH_ADMIN, defaults={"org_admin": True})
+        return College.objects.create(
+            name="Benchmark College",
+            handle=f"bench-{time.time_ns()}",
+            established_date=dt.date(2000, 1, 1),
+            admin=admin,
+            line1="Benchmark",
+        )
+
+    @contextmanager
+    def stage(self, results, name, rows):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            yield
+        elapsed = time.perf_counter() - start
+        results.append((name, elapsed, rows / elapsed if elapsed else 0, counter.count, peak_rss_mb()))
+
+    def run(self, college, count, options):
+        job = AlumniImport(college=college, staging_format=options["format"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = write_sheet(os.path.join(tmp, f"bench-{count}.csv"), count, seed=options["seed"])
+            with open(path, "rb") as f:
+                job.file.save(os.path.basename(path), File(f), save=True)
+
+        results = []
+        with self.stage(results, "parse", count):
+            for _ in iter_rows(job.file):
+                pass
+
+        progress = ImportProgress(job)
+        progress.start()
+        with self.stage(results, "stage", count):
+            stage_import(job)
+        if job.staging_format == AlumniImport.FORMAT_COLUMNAR:
+            # chunks are validated and promoted together
+            with self.stage(results, "validate+promote", count):
+                process_chunks(progress, options["workers"])
+        else:
+            with self.stage(results, "validate", count):
+                validate_import(progress, workers=options["workers"])
+            with self.stage(results, "promote", count):
+                promote_pending(progress, options["batch_size"])
+        progress.finish(AlumniImport.STATUS_DONE)
+
+        job.refresh_from_db()
+        self.stdout.write(
+            f"\n{count} rows ({job.staging_format}): {job.processed_rows} processed, {error_count(job.errors)} failed, "
+            f"{Membership.objects.filter(college=college).count()} memberships, "
+            f"{Enrollment.objects.filter(membership__college=college).count()} enrollments"
+        )
+        self.stdout.write(f"{'stage':<18}{'seconds':>10}{'rows/sec':>12}{'queries':>10}{'peak RSS MB':>14}")
+        for name, elapsed, rate, queries, rss in results:
+            self.stdout.write(f"{name:<18}{elapsed:>10.2f}{rate:>12.0f}{queries:>10}{rss:>14.1f}")
+        total = sum(elapsed for _, elapsed, *_ in results[1:])
+        self.stdout.write(self.style.SUCCESS(f"{'import total':<18}{total:>10.2f}{count / total:>12.0f}"))
+
+    def cleanup(self, college):
+        for job in college.alumni_imports.all():
+            _delete_in_batches(job.rows.all())
+            _delete_in_batches(job.chunks.all())
+            job.file.delete(save=False)
+            job.delete()
+        _delete_in_batches(Enrollment.objects.filter(membership__college=college))
+        _delete_in_batches(Membership.objects.filter(college=college))
+        college.delete()
+
+        users = User.objects.filter(email__endswith=f"@{DOMAIN}")
+        _delete_in_batches(UserDetail.objects.filter(user__in=users))
+        _delete_in_batches(users)
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from organization.imports.identity import resolve_college
+from organization.models import College
+
+
+class Command(BaseCommand):
+    help = "Find members of a college that are likely the same person and store them as duplicate candidates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("handles", nargs="*", help="College handles (default: every college)")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=None,
+            help="Minimum score of a duplicate pair (default: ALUMNI_DUPLICATE_THRESHOLD)",
+        )
+
+    def handle(self, *args, **options):
+        colleges = College.objects.filter(is_deleted=False)
+        if options["handles"]:
+            colleges = colleges.filter(handle__in=options["handles"])
+
+        for college in colleges.order_by("pk"):
+            start = time.perf_counter()
+            found = resolve_college(college, threshold=options["threshold"])
+            self.stdout.write(self.style.SUCCESS(
+                f"{college.handle}: {found} duplicate candidates in {time.perf_counter() - start:.1f}s"
+            ))
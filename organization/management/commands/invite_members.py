@@ -0,0 +1,60 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from organization.invitations import invite_members, recipients_from_import
+from organization.models import AlumniImport, College, Membership
+
+
+def recipients_from_file(path):
+    """``(email, name)`` pairs from a CSV with ``email``/``name`` columns, or one address per line."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        first = f.readline()
+        f.seek(0)
+        if "email" not in first.lower():
+            for line in f:
+                yield line.strip(), ""
+            return
+        for row in csv.DictReader(f):
+            row = {(key or "").strip().lower(): value for key, value in row.items()}
+            yield row.get("email") or "", row.get("name") or row.get("first_name") or ""
+
+
+class Command(BaseCommand):
+    help = "Invite members to a college in bulk and queue their invite emails"
+
+    def add_arguments(self, parser):
+        parser.add_argument("handle", help="College handle")
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--file", help="CSV with email and name columns, or one email per line")
+        source.add_argument("--import-job", type=int, help="Invite the rows an alumni import promoted")
+        parser.add_argument(
+            "--role",
+            choices=[role for role, _ in Membership.ROLE_CHOICES],
+            default=Membership.ROLE_ALUMNI,
+        )
+        parser.add_argument("--workers", type=int, default=None, help="Rendering processes (default: CPU count)")
+
+    def handle(self, *args, **options):
+        try:
+            college = College.objects.get(handle=options["handle"], is_deleted=False)
+        except College.DoesNotExist:
+            raise CommandError(f"College '{options['handle']}' does not exist")
+
+        job = None
+        if options["import_job"]:
+            try:
+                job = AlumniImport.objects.get(pk=options["import_job"], college=college)
+            except AlumniImport.DoesNotExist:
+                raise CommandError(f"Import {options['import_job']} does not exist for {college.handle}")
+            recipients = recipients_from_import(job)
+        else:
+            recipients = recipients_from_file(options["file"])
+
+        start = time.perf_counter()
+        invited = invite_members(college, recipients, options["role"], import_job=job, workers=options["workers"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Invited {invited} members to {college.handle} in {time.perf_counter() - start:.1f}s, "
+            "run send_queued_emails to deliver them"
+        ))
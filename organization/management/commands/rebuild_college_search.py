@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from organization.search import fts_enabled, rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the college search index from the colleges table (SQLite FTS5 only)"
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write(self.style.WARNING("No search index on this database, search uses icontains"))
+            return
+        start = time.perf_counter()
+        indexed = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} colleges in {time.perf_counter() - start:.1f}s"))
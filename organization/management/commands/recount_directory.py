@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from organization.directory import recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the college directory counters from the colleges table, "
+        "eg. after colleges were changed with queryset updates"
+    )
+
+    def handle(self, *args, **options):
+        for key, value in sorted(recount().items()):
+            self.stdout.write(f"{key}: {value}")
+        self.stdout.write(self.style.SUCCESS("Directory counters rebuilt"))
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from organization.imports.dryrun import preview_import
+from organization.imports.readers import UnsupportedFileError
+from organization.imports.worker import ImportNotRunnable, run_import
+from organization.models import AlumniImport
+
+
+class Command(BaseCommand):
+    help = "Stage and promote alumni imports. Without ids, runs every pending or interrupted import."
+
+    def add_arguments(self, parser):
+        parser.add_argument("import_ids", nargs="*", type=int)
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows promoted per transaction")
+        parser.add_argument("--workers", type=int, default=None, help="Validation processes (default: CPU count)")
+        parser.add_argument("--dry-run", action="store_true", help="Report what the import would do without writing")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new imports instead of exiting")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+
+    def handle(self, *args, **options):
+        if options["loop"]:
+            while True:
+                # a job another worker holds a live lease on is left alone
+                self.run(self.queued().filter(
+                    Q(status=AlumniImport.STATUS_PENDING)
+                    | Q(lease_expires_at__isnull=True)
+                    | Q(lease_expires_at__lt=timezone.now())
+                ), options)
+                time.sleep(options["interval"])
+
+        if options["import_ids"]:
+            jobs = AlumniImport.objects.filter(pk__in=options["import_ids"])
+        else:
+            jobs = self.queued()
+
+        if options["dry_run"]:
+            return self.preview(jobs)
+        if self.run(jobs, options):
+            raise CommandError("One or more imports failed")
+
+    def queued(self):
+        return AlumniImport.objects.filter(
+            status__in=[AlumniImport.STATUS_PENDING, AlumniImport.STATUS_PROCESSING], archived_at__isnull=True
+        )
+
+    def run(self, jobs, options):
+        """Run ``jobs`` in upload order, returns whether any of them failed."""
+        failed = False
+        for job in jobs.order_by("created_at"):
+            try:
+                run_import(job, batch_size=options["batch_size"], workers=options["workers"])
+            except ImportNotRunnable as exc:
+                self.stderr.write(str(exc))
+                continue
+            except Exception as exc:
+                failed = True
+                self.stderr.write(self.style.ERROR(f"Import {job.pk} failed: {exc}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"Import {job.pk} done: {job.processed_rows}/{job.total_rows} rows processed"
+            ))
+        return failed
+
+    def preview(self, jobs):
+        for job in jobs.order_by("created_at"):
+            try:
+                counts = preview_import(job)
+            except UnsupportedFileError as exc:
+                self.stderr.write(f"Import {job.pk}: {exc}")
+                continue
+            errors = counts.pop("errors")
+            self.stdout.write(f"Import {job.pk} (dry run)")
+            for key, value in counts.items():
+                self.stdout.write(f"  {key}: {value}")
+            for key, value in sorted(errors.items()):
+                self.stdout.write(f"  invalid {key}: {value}")
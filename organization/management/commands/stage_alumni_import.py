@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from organization.imports.readers import UnsupportedFileError
+from organization.imports.staging import stage_import
+from organization.models import AlumniImport
+
+
+class Command(BaseCommand):
+    help = "Stream an AlumniImport file into ImportedAlumniRow in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("import_id", type=int)
+        parser.add_argument("--chunk-size", type=int, default=None, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        try:
+            job = AlumniImport.objects.get(pk=options["import_id"])
+        except AlumniImport.DoesNotExist:
+            raise CommandError(f"Import {options['import_id']} does not exist")
+
+        try:
+            total = stage_import(job, chunk_size=options["chunk_size"])
+        except UnsupportedFileError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f"Staged {total} rows for import {job.pk}"))
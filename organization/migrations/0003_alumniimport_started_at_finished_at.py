@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0002_college_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumniimport',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alumniimport',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0003_alumniimport_started_at_finished_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumniimport',
+            name='staging_format',
+            field=models.CharField(choices=[('rows', 'One row per record'), ('columnar', 'Compressed columnar chunks')], default='rows', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ImportedRowChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_row', models.PositiveIntegerField()),
+                ('last_row', models.PositiveIntegerField()),
+                ('row_count', models.PositiveIntegerField()),
+                ('header', models.JSONField()),
+                ('data', models.BinaryField()),
+                ('processed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('import_job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='organization.alumniimport')),
+            ],
+            options={
+                'verbose_name': 'Imported Row Chunk',
+                'verbose_name_plural': 'Imported Row Chunks',
+                'db_table': 'imported_alumni_chunks',
+                'ordering': ['first_row'],
+                'indexes': [models.Index(fields=['import_job', 'processed'], name='imported_al_import__24b7de_idx'), models.Index(fields=['import_job', 'first_row'], name='imported_al_import__8b125c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0004_importedrowchunk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumniimport',
+            name='archive',
+            field=models.FileField(blank=True, null=True, upload_to='alumni_imports/archive/%Y/'),
+        ),
+        migrations.AddField(
+            model_name='alumniimport',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alumniimport',
+            name='summary',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:55
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_colleges(apps, schema_editor):
+    College = apps.get_model('organization', 'College')
+    DirectoryCounter = apps.get_model('organization', 'DirectoryCounter')
+    rows = College.objects.order_by().values('status', 'is_deleted').annotate(total=Count('pk'))
+    DirectoryCounter.objects.bulk_create([
+        DirectoryCounter(key=f"colleges:{row['status']}:{int(row['is_deleted'])}", value=row['total'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0007_invitation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectoryCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Directory Counter',
+                'verbose_name_plural': 'Directory Counters',
+                'db_table': 'directory_counters',
+            },
+        ),
+        migrations.RunPython(count_colleges, migrations.RunPython.noop),
+    ]
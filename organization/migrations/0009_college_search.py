@@ -0,0 +1,36 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS college_search USING fts5("
+            "name, handle, city, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+        )
+    except OperationalError:
+        # SQLite built without FTS5, search falls back to icontains
+        return
+    schema_editor.execute(
+        "INSERT INTO college_search (rowid, name, handle, city) "
+        "SELECT c.id, c.name, c.handle, COALESCE(a.city, '') FROM colleges c LEFT JOIN address a ON a.id = c.address_id "
+        "WHERE NOT c.is_deleted"
+    )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS college_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organization', '0008_directorycounter'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -209,14 +209,34 @@ class AlumniImport(models.Model):
         (STATUS_FAILED, "Failed"),
     ]
 
+    FORMAT_ROWS = "rows"
+    FORMAT_COLUMNAR = "columnar"
+    FORMAT_CHOICES = [
+        (FORMAT_ROWS, "One row per record"),
+        (FORMAT_COLUMNAR, "Compressed columnar chunks"),
+    ]
+
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="alumni_imports")
     uploaded_by = models.ForeignKey(Membership, on_delete=models.SET_NULL, null=True, related_name="uploads")
     file = models.FileField(upload_to="alumni_imports/%Y/")
+    staging_format = models.CharField(max_length=20, choices=FORMAT_CHOICES, default=FORMAT_ROWS)
     created_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, db_index=True)
     total_rows = models.PositiveIntegerField(default=0)
     processed_rows = models.PositiveIntegerField(default=0)
     errors = models.JSONField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    # the worker running the job and until when it holds it, renewed after
+    # every batch; a processing job whose lease ran out can be taken over
+    claim = models.UUIDField(null=True, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    # staged rows of finished imports are moved out of the hot tables
+    archive = models.FileField(upload_to="alumni_imports/archive/%Y/", null=True, blank=True)
+    archived_at = models.DateTimeField(null=True, blank=True)
+    summary = models.JSONField(null=True, blank=True)
 
     class Meta:
         verbose_name = "Alumni Import"
@@ -250,4 +270,116 @@ class ImportedAlumniRow(models.Model):
         ordering = ["row_number"]
 
     def __str__(self):
-        return f"Row {self.row_number} import {self.import_job.id}"
\ No newline at end of file
+        return f"Row {self.row_number} import {self.import_job.id}"
+
+
+class ImportedRowChunk(models.Model):
+    """
+    Compact alternative to ImportedAlumniRow: a run of consecutive rows stored
+    as one zlib compressed block, column by column, under a shared header.
+    Only failed rows are expanded into ImportedAlumniRow for audit and retry.
+    """
+    import_job = models.ForeignKey(AlumniImport, on_delete=models.CASCADE, related_name="chunks")
+    first_row = models.PositiveIntegerField()
+    last_row = models.PositiveIntegerField()
+    row_count = models.PositiveIntegerField()
+    header = models.JSONField()
+    data = models.BinaryField()
+    processed = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Imported Row Chunk"
+        verbose_name_plural = "Imported Row Chunks"
+        db_table = "imported_alumni_chunks"
+        indexes = [
+            models.Index(fields=["import_job", "processed"]),
+            models.Index(fields=["import_job", "first_row"]),
+        ]
+        ordering = ["first_row"]
+
+    def __str__(self):
+        return f"Rows {self.first_row}-{self.last_row} import {self.import_job_id}"
+
+
+class Invitation(models.Model):
+    """
+    An invitation for ``email`` to join a college. ``token`` is the secret part
+    of the join link sent in the invite email.
+    """
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="invitations")
+    email = models.EmailField()
+    name = models.CharField(max_length=255, blank=True)
+    role = models.CharField(max_length=20, choices=Membership.ROLE_CHOICES, default=Membership.ROLE_ALUMNI)
+    token = models.CharField(max_length=64, unique=True)
+    import_job = models.ForeignKey(
+        AlumniImport, on_delete=models.SET_NULL, null=True, blank=True, related_name="invitations"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    accepted_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Invitation"
+        verbose_name_plural = "Invitations"
+        db_table = "invitations"
+        unique_together = ("college", "email")
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.email} to {self.college}"
+
+
+class DuplicateCandidate(models.Model):
+    """
+    Two accounts of a college that likely belong to the same person, found
+    by ``find_duplicate_alumni``. ``group`` is the smallest user id of the
+    cluster the pair belongs to, so related pairs can be reviewed together.
+    """
+    STATUS_PENDING = "pending"
+    STATUS_MERGED = "merged"
+    STATUS_DISMISSED = "dismissed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending review"),
+        (STATUS_MERGED, "Merged"),
+        (STATUS_DISMISSED, "Not a duplicate"),
+    ]
+
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name="duplicate_candidates")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    other = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    group = models.PositiveIntegerField(db_index=True)
+    score = models.FloatField()
+    reasons = models.JSONField(default=list, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Duplicate Candidate"
+        verbose_name_plural = "Duplicate Candidates"
+        db_table = "duplicate_candidates"
+        unique_together = ("college", "user", "other")
+        indexes = [models.Index(fields=["college", "status"])]
+        ordering = ["-score"]
+
+    def __str__(self):
+        return f"{self.user} ~ {self.other} ({self.score:.2f})"
+
+
+class DirectoryCounter(models.Model):
+    """
+    Running count of colleges per directory bucket (status and deleted flag),
+    kept up to date by signals so the directory never runs a full COUNT.
+    ``recount_directory`` rebuilds the counts from the table.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Directory Counter"
+        verbose_name_plural = "Directory Counters"
+        db_table = "directory_counters"
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
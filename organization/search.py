@@ -0,0 +1,139 @@
+"""
+College search for the search box: prefix matching ranked by relevance.
+
+On SQLite the colleges that are not deleted are indexed in
+``college_search``, an FTS5 table whose rowid is the college id, with
+prefix indexes so that partial words ("comp eng") are matched from the
+index. The signals in ``organization.signals`` keep it in sync with
+``College`` and ``Address`` saves; ``rebuild_college_search`` fills it
+from scratch.
+
+Terms shorter than two characters are dropped: the index only holds
+prefixes of 2, 3 and 4 characters, and a one letter prefix would scan
+every row. Ranking all the matches of a short prefix costs as much as the
+number of matches, so a search first looks in the name column only and
+ranks with bm25 at most ``COLLEGE_SEARCH_CANDIDATES`` of those matches.
+Only when they do not fill ``limit`` are the other columns searched,
+again ranking a capped set of candidates (name weighs most, then handle,
+then city).
+
+Whether the index exists is checked once per database connection, and again
+after migrations.
+
+Other databases, or SQLite builds without FTS5, fall back to
+``icontains`` filters ordered by name.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from organization.models import College
+
+TABLE = "college_search"
+# bm25 weights of the name, handle and city columns
+WEIGHTS = (10.0, 5.0, 1.0)
+
+TERM = re.compile(r"\w+")
+# shortest prefix in the index
+MIN_TERM_LENGTH = 2
+
+
+def fts_enabled():
+    """Whether the FTS5 index exists (it is created by migration on SQLite only)."""
+    if connection.vendor != "sqlite":
+        return False
+    enabled = getattr(connection, "college_search_enabled", None)
+    if enabled is None:
+        enabled = connection.college_search_enabled = TABLE in connection.introspection.table_names()
+    return enabled
+
+
+def forget_fts(db):
+    """Check for the index again on the next use of connection ``db``."""
+    if hasattr(db, "college_search_enabled"):
+        del db.college_search_enabled
+
+
+def search_terms(query):
+    return [term for term in TERM.findall(query.lower()) if len(term) >= MIN_TERM_LENGTH][:8]
+
+
+def match_expression(terms):
+    """FTS5 query matching every term as a prefix; terms are \\w only, so quoting is safe."""
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def index_colleges(colleges):
+    """(Re)index the colleges of queryset ``colleges``, dropping the deleted ones."""
+    if not fts_enabled():
+        return
+    rows = colleges.order_by().values_list("pk", "name", "handle", "address__city", "is_deleted")
+    with transaction.atomic(), connection.cursor() as cursor:
+        for pk, name, handle, city, is_deleted in rows:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [pk])
+            if not is_deleted:
+                cursor.execute(
+                    f"INSERT INTO {TABLE} (rowid, name, handle, city) VALUES (%s, %s, %s, %s)",
+                    [pk, name, handle, city or ""],
+                )
+
+
+def unindex_colleges(pks):
+    if not fts_enabled() or not pks:
+        return
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", [(pk,) for pk in pks])
+
+
+def rebuild():
+    """Empty the index and add every college again, returns the number indexed."""
+    if not fts_enabled():
+        return 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, name, handle, city) "
+            "SELECT c.id, c.name, c.handle, COALESCE(a.city, '') FROM colleges c "
+            "LEFT JOIN address a ON a.id = c.address_id WHERE NOT c.is_deleted"
+        )
+        return cursor.rowcount
+
+
+def _ranked_ids(terms, limit):
+    """Ids of the best ``limit`` matches, name matches first."""
+    sql = (
+        f"SELECT id FROM (SELECT rowid AS id, bm25({TABLE}, {', '.join(map(str, WEIGHTS))}) AS score "
+        f"FROM {TABLE} WHERE {TABLE} MATCH %s LIMIT %s) ORDER BY score LIMIT %s"
+    )
+    candidates = max(getattr(settings, "COLLEGE_SEARCH_CANDIDATES", 1000), limit)
+    expression = match_expression(terms)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [f"{{name}} : ({expression})", candidates, limit])
+        ids = [row[0] for row in cursor.fetchall()]
+        if len(ids) < limit:
+            # the name matches are found again, ask for enough rows to skip them
+            cursor.execute(sql, [expression, candidates, limit + len(ids)])
+            seen = set(ids)
+            ids.extend(row[0] for row in cursor.fetchall() if row[0] not in seen)
+    return ids[:limit]
+
+
+def search_colleges(query, limit=10):
+    """Colleges matching every word of ``query`` as a prefix, best matches first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    if fts_enabled():
+        ids = _ranked_ids(terms, limit)
+        colleges = College.objects.select_related("address").filter(is_deleted=False).in_bulk(ids)
+        return [colleges[pk] for pk in ids if pk in colleges]
+
+    colleges = College.objects.select_related("address").filter(is_deleted=False)
+    for term in terms:
+        colleges = colleges.filter(
+            Q(name__icontains=term) | Q(handle__icontains=term) | Q(address__city__icontains=term)
+        )
+    return list(colleges.order_by("name", "handle")[:limit])
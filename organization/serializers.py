@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from organization.models import College, Address, SocialLink, User
+from organization.models import College, Address, Membership, SocialLink, User
 from rest_framework.validators import UniqueValidator
 from accounts import validators as v
 from django.contrib.auth.password_validation import validate_password
@@ -38,6 +38,49 @@ class CollegeSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "created_at", "updated_at")
 
 
+class CollegeDirectorySerializer(serializers.ModelSerializer):
+    address = AddressSerializer(read_only=True)
+
+    class Meta:
+        model = College
+        fields = ["id", "name", "handle", "website", "status", "address"]
+
+
+class MemberCardSerializer(serializers.ModelSerializer):
+    """Directory card of a member; reads the prefetched enrollments only."""
+    user_id = serializers.IntegerField(read_only=True)
+    name = serializers.SerializerMethodField()
+    photo = serializers.SerializerMethodField()
+    course = serializers.SerializerMethodField()
+    batch = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Membership
+        fields = ["id", "user_id", "name", "photo", "role", "course", "batch"]
+
+    def _latest_enrollment(self, member):
+        enrollments = member.enrollments.all()
+        return enrollments[0] if enrollments else None
+
+    def get_name(self, member):
+        detail = member.user.user_detail
+        if detail is None:
+            return None
+        return f"{detail.first_name} {detail.last_name}".strip()
+
+    def get_photo(self, member):
+        detail = member.user.user_detail
+        return detail.profile_pic.url if detail is not None and detail.profile_pic else None
+
+    def get_course(self, member):
+        enrollment = self._latest_enrollment(member)
+        return enrollment.course.name if enrollment and enrollment.course else None
+
+    def get_batch(self, member):
+        enrollment = self._latest_enrollment(member)
+        return enrollment.end_year if enrollment else None
+
+
 class CollegeCreateSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(write_only=True)
 
@@ -0,0 +1,89 @@
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from organization.cache import invalidate_colleges, touch_colleges
+from organization.directory import bump_counter, counter_key
+from organization.search import forget_fts, index_colleges, unindex_colleges
+from organization.models import Address, College, SocialLink
+
+
+@receiver([post_save, post_delete], sender=College)
+def drop_college(sender, instance, **kwargs):
+    invalidate_colleges([instance.handle])
+
+
+@receiver(post_save, sender=College)
+def index_college(sender, instance, **kwargs):
+    index_colleges(College.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=College)
+def unindex_college(sender, instance, **kwargs):
+    unindex_colleges([instance.pk])
+
+
+# a new connection may be to another database, and migrations may have
+# created or dropped the search index since it was checked
+@receiver(connection_created)
+def forget_search_index(sender, connection, **kwargs):
+    forget_fts(connection)
+
+
+@receiver(post_migrate)
+def recheck_search_index(sender, using, **kwargs):
+    forget_fts(connections[using])
+
+
+# the directory bucket a college was loaded in, to move it when it changes;
+# None for new colleges and for rows loaded without status/is_deleted
+@receiver(post_init, sender=College)
+def remember_directory_bucket(sender, instance, **kwargs):
+    loaded = instance.pk is not None and "status" in instance.__dict__ and "is_deleted" in instance.__dict__
+    instance._directory_key = counter_key(instance.status, instance.is_deleted) if loaded else None
+
+
+@receiver(post_save, sender=College)
+def count_saved_college(sender, instance, created, **kwargs):
+    key = counter_key(instance.status, instance.is_deleted)
+    if created:
+        bump_counter(key, 1)
+    elif instance._directory_key and key != instance._directory_key:
+        bump_counter(instance._directory_key, -1)
+        bump_counter(key, 1)
+    instance._directory_key = key
+
+
+@receiver(post_delete, sender=College)
+def count_deleted_college(sender, instance, **kwargs):
+    if instance._directory_key:
+        bump_counter(instance._directory_key, -1)
+
+
+@receiver([post_save, post_delete], sender=SocialLink)
+def touch_social_college(sender, instance, **kwargs):
+    if instance.college_id:
+        touch_colleges(College.objects.filter(pk=instance.college_id))
+
+
+# before the delete, afterwards the colleges no longer point at the address
+@receiver([post_save, pre_delete], sender=Address)
+def touch_address_colleges(sender, instance, **kwargs):
+    touch_colleges(College.objects.filter(address_id=instance.pk))
+
+
+@receiver(post_save, sender=Address)
+def index_address_colleges(sender, instance, **kwargs):
+    index_colleges(College.objects.filter(address_id=instance.pk))
+
+
+@receiver(pre_delete, sender=Address)
+def remember_address_colleges(sender, instance, **kwargs):
+    instance._college_ids = list(College.objects.filter(address_id=instance.pk).values_list("pk", flat=True))
+
+
+# after the delete, to index the colleges without the city
+@receiver(post_delete, sender=Address)
+def reindex_address_colleges(sender, instance, **kwargs):
+    index_colleges(College.objects.filter(pk__in=getattr(instance, "_college_ids", [])))
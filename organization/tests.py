@@ -1,3 +1,622 @@
-from django.test import TestCase
+import csv
+import datetime as dt
+import io
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from emails.models import OutboundEmail
+from organization import search
+from organization.imports import archive, progress, promote, validation, worker
+from organization.imports.archive import archive_import, rehydrate_import
+from organization.imports.cleaning import clean_row
+from organization.imports.columnar import read_row
+from organization.imports.dryrun import preview_import
+from organization.imports.identity import find_duplicates, resolve_college
+from organization.imports.staging import stage_import
+from organization.imports.synthetic import FIELDS, generate_rows
+from organization.imports.worker import ImportNotRunnable, run_import
+from organization.invitations import invite_members, recipients_from_import
+from organization.models import (
+    Address,
+    AlumniImport,
+    College,
+    DuplicateCandidate,
+    ImportedAlumniRow,
+    Invitation,
+    Membership,
+    SocialLink,
+)
+
+
+def alumni_row(email, phone, **fields):
+    row = dict.fromkeys(FIELDS, "")
+    row.update(email=email, phone=phone, first_name="Jane", last_name="Smith", role="alumni")
+    row.update(fields)
+    return row
+
+
+class CollegeTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(email="admin@college.com", password="x", org_admin=True)
+        self.college = College.objects.create(
+            name="ABC College", handle="abc", established_date=dt.date(2000, 1, 1), admin=self.admin, line1="x"
+        )
+
+    def auth(self, user):
+        return {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+class ImportTestCase(CollegeTestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_settings = override_settings(MEDIA_ROOT=media)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        super().setUp()
+
+    def make_job(self, rows, **fields):
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+        job = AlumniImport(college=self.college, **fields)
+        job.file.save("alumni.csv", ContentFile(out.getvalue().encode()), save=True)
+        return job
+
+
+class StagingTests(ImportTestCase):
+    def test_sheet_is_staged_in_chunks_and_resumed(self):
+        job = AlumniImport(college=self.college)
+        sheet = "Email,First Name,Phone\n" + "".join(f"user{i}@x.com,User,98765432{i:02d}\n" for i in range(5))
+        job.file.save("alumni.csv", ContentFile((sheet + ",,\n").encode()), save=True)
+
+        self.assertEqual(stage_import(job, chunk_size=2), 5)
+        self.assertEqual(job.rows.get(row_number=1).raw_data, {
+            "email": "user0@x.com", "first_name": "User", "phone": "9876543200",
+        })
+
+        # a crash after the second chunk: only the missing rows are staged again
+        job.rows.filter(row_number=5).delete()
+        self.assertEqual(stage_import(job, chunk_size=2), 5)
+        self.assertEqual(sorted(job.rows.values_list("row_number", flat=True)), [1, 2, 3, 4, 5])
+        job.refresh_from_db()
+        self.assertEqual(job.total_rows, 5)
+
+
+class ValidationTests(SimpleTestCase):
+    def test_pool_keeps_the_outcome_of_every_row_in_order(self):
+        raws = [alumni_row(f"user{i}@x.com", f"98765432{i:02d}") for i in range(7)]
+        raws[2]["email"] = "not-an-email"
+        raws[5]["role"] = "staff"
+        rows = [ImportedAlumniRow(row_number=i, raw_data=raw) for i, raw in enumerate(raws, 1)]
+
+        with mock.patch.object(validation, "MIN_PARALLEL_ROWS", 1), validation.validation_pool(3) as executor:
+            validation.validate_rows(rows, executor, workers=3)
+
+        self.assertEqual([row.success for row in rows], [True, True, False, True, True, False, True])
+        self.assertTrue(rows[2].processed)
+        self.assertTrue(rows[2].message.startswith("email:"))
+        self.assertTrue(rows[5].message.startswith("role:"))
+        self.assertFalse(rows[0].processed)
+
+
+class PromoteTests(ImportTestCase):
+    def test_new_users_sharing_a_phone(self):
+        job = self.make_job([
+            alumni_row("jsmith@x.com", "9876543210"),
+            alumni_row("jsmith.other@x.com", "9876543210"),
+        ])
+        run_import(job, workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, AlumniImport.STATUS_DONE)
+        self.assertEqual(job.processed_rows, 2)
+        first = User.objects.get(email="jsmith@x.com")
+        other = User.objects.get(email="jsmith.other@x.com")
+        self.assertEqual(first.user_detail.phone, "9876543210")
+        self.assertIsNone(other.user_detail)
+        self.assertEqual(Membership.objects.filter(college=self.college, role="alumni").count(), 2)
+
+    def test_inserted_records_get_the_model_defaults(self):
+        before = timezone.now()
+        job = self.make_job([alumni_row("jsmith@x.com", "9876543210", start_year="2018", end_year="2022")])
+        run_import(job, workers=1)
+
+        user = User.objects.get(email="jsmith@x.com")
+        self.assertFalse(user.has_usable_password())
+        self.assertTrue(user.is_active and user.is_suspended)
+        self.assertFalse(user.is_verified or user.is_staff or user.org_admin)
+        self.assertGreaterEqual(user.date_joined, before)
+        self.assertGreaterEqual(user.last_modified, before)
+        self.assertEqual((user.user_detail.first_name, user.user_detail.gender), ("Jane", ""))
+        self.assertGreaterEqual(user.user_detail.created_at, before)
+        membership = Membership.objects.get(user=user, college=self.college)
+        self.assertEqual(membership.contact_phone, "9876543210")
+        self.assertGreaterEqual(membership.created_at, before)
+        enrollment = membership.enrollments.get()
+        self.assertEqual((enrollment.start_year, enrollment.end_year, enrollment.is_confirmed), (2018, 2022, False))
+        self.assertGreaterEqual(enrollment.created_at, before)
+
+    def test_integrity_error_fails_only_the_offending_row(self):
+        resolve = promote._resolve_memberships
+
+        def flaky(college, records, users):
+            if any(data["email"] == "bad@x.com" for _, data in records):
+                raise IntegrityError("boom")
+            return resolve(college, records, users)
+
+        job = self.make_job([alumni_row("good@x.com", "9876543210"), alumni_row("bad@x.com", "9876543211")])
+        with mock.patch.object(promote, "_resolve_memberships", flaky):
+            run_import(job, workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, AlumniImport.STATUS_DONE)
+        rows = {row.raw_data["email"]: row for row in job.rows.all()}
+        self.assertTrue(rows["good@x.com"].success)
+        self.assertFalse(rows["bad@x.com"].success)
+        self.assertTrue(rows["bad@x.com"].message.startswith("database:"))
+        self.assertTrue(Membership.objects.filter(user__email="good@x.com").exists())
+
+
+@override_settings(ALUMNI_IMPORT_COLUMNAR_CHUNK_ROWS=2)
+class ColumnarTests(ImportTestCase):
+    def test_columnar_import_keeps_only_failed_rows(self):
+        job = self.make_job(
+            [alumni_row(f"user{i}@x.com", f"98765432{i:02d}") for i in range(4)] + [alumni_row("bad", "9876543299")],
+            staging_format=AlumniImport.FORMAT_COLUMNAR,
+        )
+        run_import(job, workers=1)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_rows), (AlumniImport.STATUS_DONE, 5))
+        self.assertEqual(job.chunks.count(), 3)
+        self.assertTrue(all(job.chunks.values_list("processed", flat=True)))
+        self.assertEqual(list(job.rows.values_list("row_number", flat=True)), [5])
+        self.assertEqual(User.objects.filter(email__startswith="user").count(), 4)
+        self.assertEqual(read_row(job, 3)["email"], "user2@x.com")
+        self.assertIsNone(read_row(job, 6))
+
+
+class ProgressTests(ImportTestCase):
+    def test_snapshot_read_from_the_database_is_short_lived_while_running(self):
+        job = self.make_job([alumni_row("alice@x.com", "9876543210")])
+        with mock.patch.object(progress, "cache") as fake:
+            fake.get.return_value = None
+            self.assertEqual(progress.get_snapshot(job.pk)["status"], AlumniImport.STATUS_PENDING)
+            self.assertEqual(fake.set.call_args.args[2], progress.ACTIVE_FALLBACK_TTL)
+
+            AlumniImport.objects.filter(pk=job.pk).update(status=AlumniImport.STATUS_DONE)
+            self.assertEqual(progress.get_snapshot(job.pk)["status"], AlumniImport.STATUS_DONE)
+            self.assertEqual(fake.set.call_args.args[2], progress.get_snapshot_ttl())
+
+    def test_progress_of_a_finished_import(self):
+        job = self.make_job([alumni_row("alice@x.com", "9876543210"), alumni_row("bad-email", "9876543211")])
+        run_import(job, workers=1)
+
+        response = self.client.get(f"/imports/{job.pk}/progress/", **self.auth(self.admin))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["status"], AlumniImport.STATUS_DONE)
+        self.assertEqual((data["total_rows"], data["processed_rows"], data["error_count"]), (2, 2, 1))
+        self.assertNotIn("college_admin", data)
+
+    def test_progress_is_only_for_the_college_admin(self):
+        job = self.make_job([alumni_row("alice@x.com", "9876543210")])
+        other = User.objects.create_user(email="other@x.com", password="x")
+        response = self.client.get(f"/imports/{job.pk}/progress/", **self.auth(other))
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get(f"/imports/{job.pk + 1}/progress/", **self.auth(self.admin))
+        self.assertEqual(response.status_code, 404)
+
+
+class ErrorExportTests(ImportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.make_job([
+            alumni_row("alice@x.com", "9876543210"),
+            alumni_row("bad-email", "9876543211"),
+            alumni_row("bobby@x.com", "12345"),
+        ])
+        run_import(self.job, workers=1)
+
+    def download(self, fmt, query=""):
+        return self.client.get(f"/imports/{self.job.pk}/errors.{fmt}{query}", **self.auth(self.admin))
+
+    def test_csv_report_lists_the_failed_rows(self):
+        response = self.download("csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([line["row_number"] for line in lines], ["2", "3"])
+        self.assertEqual(lines[0]["email"], "bad-email")
+        self.assertTrue(lines[1]["message"].startswith("phone:"))
+
+    def test_csv_header_has_the_columns_of_every_row(self):
+        job = AlumniImport(college=self.college)
+        sheet = "email,first_name,phone,role\nbad\nbobby@x.com,Bobby,12345,alumni\n"
+        job.file.save("short.csv", ContentFile(sheet.encode()), save=True)
+        run_import(job, workers=1)
+
+        response = self.client.get(f"/imports/{job.pk}/errors.csv", **self.auth(self.admin))
+        lines = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([line["email"] for line in lines], ["bad", "bobby@x.com"])
+        self.assertEqual((lines[0]["phone"], lines[1]["phone"], lines[1]["role"]), ("", "12345", "alumni"))
+
+    def test_jsonl_report_filtered_by_error_type(self):
+        response = self.download("jsonl", "?type=email")
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([record["row_number"] for record in records], [2])
+        self.assertEqual(self.download("jsonl", "?type=nope").status_code, 400)
+
+    def test_report_of_an_archived_import(self):
+        archive_import(self.job)
+        response = self.download("jsonl")
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([record["row_number"] for record in records], [2, 3])
+
+
+class WorkerTests(ImportTestCase):
+    def test_processing_job_with_a_live_lease_is_not_taken_over(self):
+        job = self.make_job(
+            [alumni_row("alice@x.com", "9876543210")],
+            status=AlumniImport.STATUS_PROCESSING,
+            claim=uuid.uuid4(),
+            lease_expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        with self.assertRaisesMessage(ImportNotRunnable, "another worker"):
+            run_import(job, workers=1)
+        self.assertFalse(job.rows.exists())
+
+    def test_processing_job_with_an_expired_lease_is_resumed(self):
+        job = self.make_job(
+            [alumni_row("alice@x.com", "9876543210")],
+            status=AlumniImport.STATUS_PROCESSING,
+            claim=uuid.uuid4(),
+            lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        run_import(job, workers=1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, AlumniImport.STATUS_DONE)
+        self.assertIsNone(job.claim)
+        self.assertTrue(User.objects.filter(email="alice@x.com").exists())
+
+    def test_archived_job_is_not_run(self):
+        job = self.make_job(
+            [alumni_row("alice@x.com", "9876543210")], status=AlumniImport.STATUS_FAILED, archived_at=timezone.now()
+        )
+        with self.assertRaisesMessage(ImportNotRunnable, "archived"):
+            run_import(job, workers=1)
+        self.assertFalse(job.rows.exists())
+
+    def test_batch_is_rolled_back_when_the_lease_is_lost(self):
+        job = self.make_job([alumni_row("alice@x.com", "9876543210"), alumni_row("bobby@x.com", "9876543211")])
+        promote_rows = worker.promote_rows
+
+        def taken_over(job, rows):
+            AlumniImport.objects.filter(pk=job.pk).update(claim=uuid.uuid4())
+            return promote_rows(job, rows)
+
+        with mock.patch.object(worker, "promote_rows", taken_over), self.assertRaises(ImportNotRunnable):
+            run_import(job, workers=1, batch_size=1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, AlumniImport.STATUS_PROCESSING)
+        self.assertEqual(job.processed_rows, 0)
+        self.assertFalse(User.objects.filter(email="alice@x.com").exists())
+
+    def test_loop_runs_queued_jobs_and_leaves_leased_ones(self):
+        job = self.make_job([alumni_row("alice@x.com", "9876543210")])
+        leased = self.make_job(
+            [alumni_row("bobby@x.com", "9876543211")],
+            status=AlumniImport.STATUS_PROCESSING,
+            claim=uuid.uuid4(),
+            lease_expires_at=timezone.now() + timedelta(minutes=5),
+        )
+        stderr = io.StringIO()
+        with mock.patch("time.sleep", side_effect=KeyboardInterrupt), self.assertRaises(KeyboardInterrupt):
+            call_command("run_alumni_import", "--loop", "--workers", "1", stdout=io.StringIO(), stderr=stderr)
+
+        job.refresh_from_db()
+        leased.refresh_from_db()
+        self.assertEqual(job.status, AlumniImport.STATUS_DONE)
+        self.assertEqual(leased.status, AlumniImport.STATUS_PROCESSING)
+        self.assertEqual(stderr.getvalue(), "")
+
+
+class SyntheticSheetTests(SimpleTestCase):
+    def test_only_the_invalid_rate_fails_validation(self):
+        for row in generate_rows(2000, invalid_rate=0):
+            clean_row(row)
+
+    def test_new_people_share_phones(self):
+        emails = {}
+        for row in generate_rows(2000, shared_phone_rate=0.05, invalid_rate=0):
+            emails.setdefault(row["phone"], set()).add(row["email"])
+        self.assertTrue(any(len(shared) > 1 for shared in emails.values()))
+
+
+class ArchiveTests(ImportTestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = self.make_job([alumni_row("alice@x.com", "9876543210"), alumni_row("bobby@x.com", "9876543211")])
+        run_import(self.job, workers=1)
+        self.job.refresh_from_db()
+
+    def archive_files(self):
+        root = os.path.join(self.job.file.storage.location, "alumni_imports", "archive")
+        return [name for _, _, names in os.walk(root) for name in names]
+
+    def test_interrupted_archive_is_finished_by_the_next_call(self):
+        with mock.patch.object(archive, "_delete_staged", side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            archive_import(self.job)
+        self.job.refresh_from_db()
+        self.assertIsNone(self.job.archived_at)
+        self.assertTrue(self.job.archive)
+        with self.assertRaisesMessage(ImportNotRunnable, "archived"):
+            run_import(self.job, workers=1)
+
+        summary = archive_import(self.job)
+        self.job.refresh_from_db()
+        self.assertIsNotNone(self.job.archived_at)
+        self.assertEqual(summary["rows"], 2)
+        self.assertFalse(self.job.rows.exists())
+        self.assertEqual(len(self.archive_files()), 1)
+
+    def test_rehydrate_removes_the_archive_file(self):
+        archive_import(self.job)
+        self.job.refresh_from_db()
+        self.assertEqual(rehydrate_import(self.job), 2)
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.archive)
+        self.assertEqual(self.archive_files(), [])
+
+        archive_import(self.job)
+        self.assertEqual(len(self.archive_files()), 1)
+
+
+class PreviewTests(ImportTestCase):
+    def enrolled_row(self, email, phone, **fields):
+        fields = {"course": "BTech", "enrollment_number": "EN1", "start_year": "2010", "end_year": "2014", **fields}
+        return alumni_row(email, phone, **fields)
+
+    def test_preview_uses_the_promotion_keys(self):
+        run_import(self.make_job([self.enrolled_row("alice@x.com", "9876543210")]), workers=1)
+
+        counts = preview_import(self.make_job([
+            self.enrolled_row("alice@x.com", "9876543210"),
+            # same enrollment number, other years: promotion adds an enrollment
+            self.enrolled_row("alice@x.com", "9876543210", start_year="2014", end_year="2016"),
+            self.enrolled_row("alice@x.com", "9876543210", role="faculty"),
+            self.enrolled_row("bobby@x.com", "9876543211", enrollment_number="EN2"),
+        ]))
+        self.assertEqual(counts["existing_users"], 3)
+        self.assertEqual(counts["new_users"], 1)
+        self.assertEqual(counts["existing_memberships"], 2)
+        self.assertEqual(counts["new_memberships"], 2)
+        self.assertEqual(counts["existing_enrollments"], 1)
+        self.assertEqual(counts["new_enrollments"], 3)
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        search.forget_fts(connection)
+        if not search.fts_enabled():
+            self.skipTest("SQLite FTS5 is not available")
+        self.admin = User.objects.create_user(email="admin@college.com", password="x", org_admin=True)
+
+    def test_name_matches_come_first(self):
+        pune = Address.objects.create(city="Pune", state="Maharashtra")
+        College.objects.bulk_create(
+            College(
+                name=f"College {i}", handle=f"c{i}", established_date=dt.date(2000, 1, 1),
+                admin=self.admin, line1="x", address=pune,
+            )
+            for i in range(1500)
+        )
+        # indexed last, behind every city match, but the only name match
+        College.objects.create(
+            name="Pune Institute", handle="pi", established_date=dt.date(2000, 1, 1), admin=self.admin, line1="x"
+        )
+        search.rebuild()
+
+        self.assertEqual([college.handle for college in search.search_colleges("pune", limit=1)], ["pi"])
+        # city matches fill the rest
+        handles = [college.handle for college in search.search_colleges("pune", limit=3)]
+        self.assertEqual(handles[0], "pi")
+        self.assertEqual(len(set(handles)), 3)
+
+    def test_one_letter_terms_are_ignored(self):
+        College.objects.create(
+            name="Pune Institute", handle="pi", established_date=dt.date(2000, 1, 1), admin=self.admin, line1="x"
+        )
+        search.rebuild()
+
+        self.assertEqual(search.search_colleges("p"), [])
+        self.assertEqual([college.handle for college in search.search_colleges("p pu i")], ["pi"])
+
+    def test_index_is_checked_again_after_a_new_connection(self):
+        connection.college_search_enabled = False
+        search.forget_fts(connection)
+        self.assertTrue(search.fts_enabled())
+
+
+class IdentityTests(ImportTestCase):
+    def test_second_account_of_a_person_is_found_once(self):
+        enrolled = {"course": "BTech", "enrollment_number": "EN1", "start_year": "2010", "end_year": "2014"}
+        run_import(self.make_job([
+            alumni_row("jsmith@x.com", "9876543210", **enrolled),
+            alumni_row("jsmith.other@x.com", "9876543210", **enrolled),
+            alumni_row("rahul@x.com", "9876543211", first_name="Rahul", last_name="Verma"),
+        ]), workers=1)
+
+        self.assertEqual(resolve_college(self.college), 1)
+        pair = DuplicateCandidate.objects.get()
+        self.assertEqual({pair.user.email, pair.other.email}, {"jsmith@x.com", "jsmith.other@x.com"})
+        self.assertIn("phone", pair.reasons)
+        self.assertIn("enrollment_number", pair.reasons)
+
+        # a reviewed pair keeps its status when the search runs again
+        DuplicateCandidate.objects.update(status=DuplicateCandidate.STATUS_DISMISSED)
+        self.assertEqual(resolve_college(self.college), 1)
+        self.assertEqual(DuplicateCandidate.objects.get().status, DuplicateCandidate.STATUS_DISMISSED)
+
+    def test_different_dates_of_birth_are_not_duplicates(self):
+        def record(dob):
+            return {"email": "", "name": "jane smith", "phones": set(), "dob": dob, "enrollment_numbers": set()}
+
+        records = {1: record(dt.date(1990, 1, 1)), 2: record(dt.date(1990, 1, 1)), 3: record(dt.date(1995, 5, 5))}
+        self.assertEqual([(a, b) for a, b, *_ in find_duplicates(records)], [(1, 2)])
+
+
+class InvitationTests(ImportTestCase):
+    def test_each_new_address_is_invited_once(self):
+        recipients = [("Alice@x.com", "Alice"), ("alice@x.com", "Again"), ("bad", ""), ("bobby@x.com", "")]
+        self.assertEqual(invite_members(self.college, recipients, workers=1), 2)
+        self.assertEqual(invite_members(self.college, [("bobby@x.com", ""), ("carol@x.com", "")], workers=1), 1)
+
+        invitations = {invitation.email: invitation for invitation in Invitation.objects.all()}
+        self.assertEqual(set(invitations), {"alice@x.com", "bobby@x.com", "carol@x.com"})
+        self.assertEqual(invitations["alice@x.com"].name, "Alice")
+        email = OutboundEmail.objects.get(to=["alice@x.com"])
+        self.assertIn(invitations["alice@x.com"].token, email.html)
+        self.assertIn("Dear Alice", email.body)
+        self.assertEqual(OutboundEmail.objects.count(), 3)
+
+    def test_recipients_of_an_import_are_its_promoted_rows(self):
+        job = self.make_job([alumni_row("alice@x.com", "9876543210"), alumni_row("bad", "9876543211")])
+        run_import(job, workers=1)
+        self.assertEqual(list(recipients_from_import(job)), [("alice@x.com", "Jane")])
+
+
+class CollegePageTests(CollegeTestCase):
+    def test_page_is_served_from_the_cache(self):
+        self.assertEqual(self.client.get("/colleges/abc/").status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.get("/colleges/abc/")
+        self.assertEqual(response.json()["data"]["handle"], "abc")
+
+    def test_social_link_change_drops_the_page(self):
+        self.client.get("/colleges/abc/")
+        SocialLink.objects.create(college=self.college, type="linkedin", url="https://linkedin.com/school/abc")
+        socials = self.client.get("/colleges/abc/").json()["data"]["socials"]
+        self.assertEqual([social["type"] for social in socials], ["linkedin"])
+
+    def test_unknown_college(self):
+        self.assertEqual(self.client.get("/colleges/nope/").status_code, 404)
+
+
+class CollegeConditionalGetTests(CollegeTestCase):
+    def test_validators_and_cache_control(self):
+        response = self.client.get("/colleges/abc/")
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=60", response["Cache-Control"])
+
+        response = self.client.get("/colleges/abc/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get("/colleges/abc/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_address_change_changes_the_etag(self):
+        self.college.address = Address.objects.create(city="Pune", state="Maharashtra")
+        self.college.save()
+        etag = self.client.get("/colleges/abc/")["ETag"]
+
+        address = self.college.address
+        address.city = "Mumbai"
+        address.save()
+        response = self.client.get("/colleges/abc/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"]["address"]["city"], "Mumbai")
+
+
+class CollegeDirectoryTests(CollegeTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(4):
+            College.objects.create(
+                name="Same Name" if i < 3 else "Another", handle=f"c{i}", established_date=dt.date(2000, 1, 1),
+                admin=self.admin, line1="x", status="approved",
+            )
+
+    def directory(self, **params):
+        response = self.client.get("/colleges/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["data"]
+
+    def test_pages_follow_the_cursor_without_gaps(self):
+        handles, cursor = [], None
+        while True:
+            data = self.directory(page_size=2, **({"cursor": cursor} if cursor else {}))
+            handles += [college["handle"] for college in data["results"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(handles, ["abc", "c3", "c0", "c1", "c2"])
+        self.assertEqual(self.client.get("/colleges/", {"cursor": "nope"}).status_code, 400)
+
+    def test_totals_follow_status_changes(self):
+        self.assertEqual(self.directory(status="approved")["approximate_total"], 4)
+        self.assertEqual(self.directory()["approximate_total"], 5)
+
+        college = College.objects.get(handle="c0")
+        college.status = "rejected"
+        college.save()
+        College.objects.get(handle="c1").delete()
+        self.assertEqual(self.directory(status="approved")["approximate_total"], 2)
+        self.assertEqual(self.directory(status="approved,rejected")["approximate_total"], 3)
+
+
+class MemberDirectoryTests(ImportTestCase):
+    def setUp(self):
+        super().setUp()
+        batch_2014 = {"course": "BTech", "start_year": "2010", "end_year": "2014"}
+        batch_2018 = {"course": "MBA", "start_year": "2016", "end_year": "2018"}
+        run_import(self.make_job([
+            alumni_row("alice@x.com", "9876543210", first_name="Alice", enrollment_number="EN1", **batch_2014),
+            alumni_row("alice@x.com", "9876543210", first_name="Alice", enrollment_number="EN9", **batch_2014),
+            alumni_row("bobby@x.com", "9876543211", first_name="Bobby", **batch_2018),
+            alumni_row("carol@x.com", "9876543212", first_name="Carol", role="faculty"),
+        ]), workers=1)
+
+    def members(self, user=None, **params):
+        return self.client.get("/colleges/abc/members/", params, **self.auth(user or self.admin))
+
+    def names(self, **params):
+        response = self.members(**params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [member["name"] for member in response.json()["data"]["results"]]
+
+    def test_filters(self):
+        self.assertEqual(self.names(), ["Carol Smith", "Bobby Smith", "Alice Smith"])
+        self.assertEqual(self.names(role="faculty"), ["Carol Smith"])
+        self.assertEqual(self.names(end_year=2014), ["Alice Smith"])
+        self.assertEqual(self.members(role="staff").status_code, 400)
+
+    def test_pages_cost_the_same_queries(self):
+        # the college, a page of members with their profiles, their enrollments
+        self.members(page_size=1)
+        with self.assertNumQueries(3):
+            self.members(page_size=1)
+        with self.assertNumQueries(3):
+            self.members(page_size=3)
+
+    def test_only_members_can_list(self):
+        outsider = User.objects.create_user(email="outsider@x.com", password="x")
+        self.assertEqual(self.members(outsider).status_code, 403)
+        self.assertEqual(self.members(User.objects.get(email="bobby@x.com")).status_code, 200)
@@ -4,6 +4,11 @@ from organization import views
 urlpatterns = [
     path("onboard/colleges/", views.OnboardCollegeAPIView.as_view(), name="college-onboard"),
     path("onboard/colleges/verify/", views.EmailVerifyViewSet.as_view(), name="college-verify"),
+    path("colleges/search/", views.CollegeSearchAPIView.as_view(), name="college-search"),
+    path("colleges/<str:handle>/members/", views.CollegeMembersAPIView.as_view(), name="college-members"),
     path("colleges/<str:handle>/", views.CollegeDetailAPIView.as_view(), name="college-detail"),
     path("colleges/", views.CollegeAPIView.as_view(), name="add-college"),
+    path("imports/<int:pk>/progress/", views.AlumniImportProgressAPIView.as_view(), name="import-progress"),
+    path("imports/<int:pk>/errors.csv", views.AlumniImportErrorsAPIView.as_view(), {"fmt": "csv"}, name="import-errors-csv"),
+    path("imports/<int:pk>/errors.jsonl", views.AlumniImportErrorsAPIView.as_view(), {"fmt": "jsonl"}, name="import-errors-jsonl"),
 ]
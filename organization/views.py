@@ -1,16 +1,29 @@
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny, IsAuthenticated
-from organization.models import College, User
-from organization.serializers import CollegeSerializer, OnboardSerializer, CollegeCreateSerializer
+from django.db.models import Exists, OuterRef
+from organization.models import AlumniImport, College, Enrollment, Membership, User
+from organization.serializers import CollegeSerializer, OnboardSerializer, CollegeCreateSerializer, CollegeDirectorySerializer, MemberCardSerializer
 import datetime as dt
-import random as rd
+import hashlib
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from accounts.otp import EXPIRED, PURPOSE_EMAIL_VERIFY, VERIFIED, get_otp_store
+from accounts.throttling import OnboardRateThrottle, OTPVerifyRateThrottle
 from emails.utils import send_admin_onboarding_otp
+from organization.imports.export import CONTENT_TYPES, export_errors
+from organization.imports.progress import get_snapshot
+from organization.cache import get_college_modified, get_college_page, invalidate_colleges
+from organization.directory import InvalidCursor, approximate_total, college_page, member_page
+from organization.search import search_colleges
 
 
 class OnboardCollegeAPIView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OnboardRateThrottle]
 
     def post(self, request):
         serializer = OnboardSerializer(data=request.data)
@@ -20,23 +33,30 @@ class OnboardCollegeAPIView(APIView):
             password = data.get("password")
             try:
                 # Check if user exists
-                if User.objects.get(email=email):
+                user = User.objects.get(email=email)
+                if not user.is_verified and user.check_password(password):
+                    # the previous OTP may have expired, send a new one
+                    send_admin_onboarding_otp(email, get_otp_store(PURPOSE_EMAIL_VERIFY).issue(email))
                     res = {
-                        "status": "failed",
-                        "message": "Account already exists",
-                        "data": {"email": email},
+                        "status": "success",
+                        "message": "OTP sent again. Please verify your email.",
+                        "data": {"userId": user.id, "email": user.email},
                     }
-                    return Response(res, status=status.HTTP_409_CONFLICT)
+                    return Response(res, status=status.HTTP_200_OK)
+
+                res = {
+                    "status": "failed",
+                    "message": "Account already exists",
+                    "data": {"email": email},
+                }
+                return Response(res, status=status.HTTP_409_CONFLICT)
 
             except User.DoesNotExist:
                 # Create college_admin
                 college_admin = User.objects.create_user(email=email, password=password, org_admin=True)
 
-                # Generate OTP
-                otp = str(rd.randint(100000, 999999))
-                college_admin.email_otp = otp
-                college_admin.email_otp_ts = dt.datetime.now()
-                college_admin.save()
+                # Generate OTP, kept in the OTP store with an expiry
+                otp = get_otp_store(PURPOSE_EMAIL_VERIFY).issue(email)
 
                 # Send OTP via Email
                 send_admin_onboarding_otp(email, otp)
@@ -59,6 +79,7 @@ class OnboardCollegeAPIView(APIView):
 
 class EmailVerifyViewSet(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [OTPVerifyRateThrottle]
 
     def post(self, request):
         email = request.data.get("email")
@@ -72,6 +93,15 @@ class EmailVerifyViewSet(APIView):
             }
             return Response(res, status=status.HTTP_400_BAD_REQUEST)
 
+        # the OTP is checked before touching the database
+        result = get_otp_store(PURPOSE_EMAIL_VERIFY).verify(email.lower(), otp)
+        if result == EXPIRED:
+            res = {"status": "failed", "message": "OTP expired, please request a new one", "data": {}}
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+        if result != VERIFIED:
+            res = {"status": "failed", "message": "Invalid OTP", "data": {}}
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             user = User.objects.get(email=email.lower())
         except User.DoesNotExist:
@@ -82,15 +112,10 @@ class EmailVerifyViewSet(APIView):
             }
             return Response(res, status=status.HTTP_404_NOT_FOUND)
 
-        if user.email_otp != otp:
-            res = {"status": "failed", "message": "Invalid OTP", "data": {}}
-            return Response(res, status=status.HTTP_400_BAD_REQUEST)
-
         # Mark verified
         user.is_verified = True
         user.email_verified_at = dt.datetime.now()
-        user.email_otp = None
-        user.save()
+        user.save(update_fields=["is_verified", "email_verified_at", "last_modified"])
 
         res = {
                 "status": "success", 
@@ -100,10 +125,70 @@ class EmailVerifyViewSet(APIView):
         return Response(res, status=status.HTTP_200_OK)
 
 
+def _page_size(request):
+    default = getattr(settings, "DIRECTORY_PAGE_SIZE", 20)
+    try:
+        size = int(request.query_params.get("page_size", default))
+    except ValueError:
+        size = default
+    return min(max(size, 1), getattr(settings, "DIRECTORY_MAX_PAGE_SIZE", 100))
+
+
 class CollegeAPIView(APIView):
     authentication_classes = []  # No authentication
     permission_classes = []      # Open to all
 
+    def get(self, request):
+        """
+        College directory in name order, filtered by ``status`` (repeat or
+        comma separate for several), ``is_deleted`` (default false), ``city``
+        and ``state``. Pass ``cursor`` from the previous page to get the next
+        one. ``approximate_total`` is null when filtering by city or state.
+        """
+        params = request.query_params
+        statuses = [value for param in params.getlist("status") for value in param.split(",") if value]
+        valid = {choice for choice, _ in College.STATUS_CHOICES}
+        if not set(statuses) <= valid:
+            res = {
+                    "status": "failed",
+                    "message": f"Invalid status, expected one of: {', '.join(sorted(valid))}",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+        is_deleted = params.get("is_deleted", "false").lower() in ("1", "true", "yes")
+
+        colleges = College.objects.select_related("address").filter(is_deleted=is_deleted)
+        if statuses:
+            colleges = colleges.filter(status__in=statuses)
+        if params.get("city"):
+            colleges = colleges.filter(address__city=params["city"])
+        if params.get("state"):
+            colleges = colleges.filter(address__state=params["state"])
+
+        try:
+            rows, next_cursor = college_page(colleges, params.get("cursor"), _page_size(request))
+        except InvalidCursor:
+            res = {
+                    "status": "failed",
+                    "message": "Invalid cursor",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+
+        total = None
+        if not (params.get("city") or params.get("state")):
+            total = approximate_total(statuses or sorted(valid), is_deleted)
+        res = {
+                "status": "success",
+                "message": "Colleges fetched successfully",
+                "data": {
+                    "results": CollegeDirectorySerializer(rows, many=True).data,
+                    "next_cursor": next_cursor,
+                    "approximate_total": total,
+                },
+            }
+        return Response(res, status=status.HTTP_200_OK)
+
     def post(self, request):
         serializer = CollegeCreateSerializer(data=request.data)
         if serializer.is_valid():
@@ -145,6 +230,121 @@ class CollegeAPIView(APIView):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class CollegeSearchAPIView(APIView):
+    """
+    GET: Colleges whose name, handle or city start with the words of ``q``,
+    best matches first. Meant for the search box, ``limit`` defaults to 10.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        try:
+            limit = min(max(int(request.query_params.get("limit", 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        colleges = search_colleges(request.query_params.get("q", ""), limit=limit)
+        res = {
+                "status": "success",
+                "message": "Colleges fetched successfully",
+                "data": CollegeDirectorySerializer(colleges, many=True).data,
+            }
+        return Response(res, status=status.HTTP_200_OK)
+
+
+class CollegeMembersAPIView(APIView):
+    """
+    GET: Member directory of a college, for its admin and members.
+    Filters: ``role``, ``course`` (course id) and ``end_year`` (batch); pass
+    ``cursor`` from the previous page to get the next one.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, handle, *args, **kwargs):
+        try:
+            college = College.objects.get(handle=handle)
+        except College.DoesNotExist:
+            res = {
+                    "status": "failed",
+                    "message": "College not found",
+                    "data": {}
+                }
+            return Response(res, status=status.HTTP_404_NOT_FOUND)
+
+        if college.admin_id != request.user.id and not Membership.objects.filter(college=college, user=request.user).exists():
+            res = {
+                    "status": "failed",
+                    "message": "Only members of the college can view its members",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_403_FORBIDDEN)
+
+        params = request.query_params
+        members = Membership.objects.filter(college=college)
+        if params.get("role"):
+            if params["role"] not in dict(Membership.ROLE_CHOICES):
+                res = {
+                        "status": "failed",
+                        "message": "Invalid role",
+                        "data": {},
+                    }
+                return Response(res, status=status.HTTP_400_BAD_REQUEST)
+            members = members.filter(role=params["role"])
+
+        enrollment_filters = {}
+        try:
+            if params.get("course"):
+                enrollment_filters["course_id"] = int(params["course"])
+            if params.get("end_year"):
+                enrollment_filters["end_year"] = int(params["end_year"])
+        except ValueError:
+            res = {
+                    "status": "failed",
+                    "message": "course and end_year must be numbers",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+        if enrollment_filters:
+            # one enrollment has to match every filter, and a member is listed once
+            members = members.filter(
+                Exists(Enrollment.objects.filter(membership=OuterRef("pk"), **enrollment_filters))
+            )
+
+        try:
+            rows, next_cursor = member_page(members, params.get("cursor"), _page_size(request))
+        except InvalidCursor:
+            res = {
+                    "status": "failed",
+                    "message": "Invalid cursor",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+
+        res = {
+                "status": "success",
+                "message": "Members fetched successfully",
+                "data": {
+                    "results": MemberCardSerializer(rows, many=True).data,
+                    "next_cursor": next_cursor,
+                },
+            }
+        return Response(res, status=status.HTTP_200_OK)
+
+
+def _college_etag(handle, modified):
+    return quote_etag(hashlib.sha1(f"{handle}:{modified.isoformat()}".encode()).hexdigest())
+
+
+def _public_cache_headers(response, handle, modified):
+    """Validators and ``Cache-Control`` of a public college page."""
+    response["ETag"] = _college_etag(handle, modified)
+    response["Last-Modified"] = http_date(modified.timestamp())
+    patch_cache_control(response, public=True, max_age=getattr(settings, "COLLEGE_HTTP_MAX_AGE", 60))
+    return response
+
+
 class CollegeDetailAPIView(APIView):
     """
     GET: Anyone can fetch a college by handle (with social URLs).
@@ -154,9 +354,21 @@ class CollegeDetailAPIView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request, handle, *args, **kwargs):
-        try:
-            college = College.objects.get(handle=handle)
-        except College.DoesNotExist:
+        """
+        Validators come from the cached page or from ``updated_at`` alone, so
+        a conditional request that matches gets a 304 before any serialization.
+        """
+        page = None
+        modified = get_college_modified(handle)
+        if modified is not None:
+            not_modified = get_conditional_response(
+                request, etag=_college_etag(handle, modified), last_modified=int(modified.timestamp())
+            )
+            if not_modified is not None:
+                return _public_cache_headers(not_modified, handle, modified)
+            page = get_college_page(handle)
+
+        if page is None:
             res = {
                     "status": "failed", 
                     "message": "College not found",
@@ -164,13 +376,12 @@ class CollegeDetailAPIView(APIView):
                 }
             return Response(res, status=status.HTTP_404_NOT_FOUND)
 
-        serializer = CollegeSerializer(college)
         res = {
                 "status": "success",
                 "message": "College details fetched successfully",
-                "data": serializer.data,
+                "data": page["data"],
             }
-        return Response(res, status=status.HTTP_200_OK)
+        return _public_cache_headers(Response(res, status=status.HTTP_200_OK), handle, page["modified"])
 
     def patch(self, request, handle, *args, **kwargs):
         try:
@@ -196,6 +407,8 @@ class CollegeDetailAPIView(APIView):
         serializer = CollegeSerializer(college, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            # saving drops the entry of the new handle, not of a renamed one
+            invalidate_colleges([handle])
             res = {
                     "status": "success",
                     "message": "College details updated successfully",
@@ -209,3 +422,80 @@ class CollegeDetailAPIView(APIView):
                 "data": serializer.errors,
             }
         return Response(res, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AlumniImportProgressAPIView(APIView):
+    """
+    GET: Progress of an alumni import, for the admin of its college.
+    Served from the cached progress snapshot, dashboards poll it every second.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        snapshot = get_snapshot(pk)
+        if snapshot is None:
+            res = {
+                    "status": "failed",
+                    "message": "Import not found",
+                    "data": {}
+                }
+            return Response(res, status=status.HTTP_404_NOT_FOUND)
+
+        if snapshot["college_admin"] != request.user.id and not request.user.is_staff:
+            res = {
+                    "status": "failed",
+                    "message": "Only college admin can view import progress",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_403_FORBIDDEN)
+
+        data = {key: value for key, value in snapshot.items() if key != "college_admin"}
+        res = {
+                "status": "success",
+                "message": "Import progress fetched successfully",
+                "data": data,
+            }
+        return Response(res, status=status.HTTP_200_OK)
+
+
+class AlumniImportErrorsAPIView(APIView):
+    """
+    GET: Download the failed rows of an alumni import as CSV or JSONL,
+    optionally filtered by error type (?type=email). The report is streamed.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, fmt, *args, **kwargs):
+        try:
+            job = AlumniImport.objects.select_related("college").get(pk=pk)
+        except AlumniImport.DoesNotExist:
+            res = {
+                    "status": "failed",
+                    "message": "Import not found",
+                    "data": {}
+                }
+            return Response(res, status=status.HTTP_404_NOT_FOUND)
+
+        if job.college.admin_id != request.user.id and not request.user.is_staff:
+            res = {
+                    "status": "failed",
+                    "message": "Only college admin can download import errors",
+                    "data": {},
+                }
+            return Response(res, status=status.HTTP_403_FORBIDDEN)
+
+        error_type = request.query_params.get("type")
+        error_types = ((job.errors or {}).get("rows") or {}).keys()
+        if error_type and error_type not in error_types:
+            res = {
+                    "status": "failed",
+                    "message": "Unknown error type",
+                    "data": {"types": sorted(error_types)},
+                }
+            return Response(res, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(export_errors(job, fmt, error_type), content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="import-{job.pk}-errors.{fmt}"'
+        return response